@@ -0,0 +1,200 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import pygame
+
+BUNDLE_MAGIC = b"NNAB"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct("<4sII")
+IMAGE_FORMAT = "RGBX"
+
+# Printable ASCII covers the digits and every label; the rest are the symbols the UI strings use
+GLYPH_CHARS = "".join(chr(c) for c in range(32, 127)) + "•✓🎉🥇🥈🥉🥷"
+
+
+def source_checksum(path, *params):
+    """CRC of a source file and the parameters it was built with, or None if it is missing"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return zlib.crc32(data, zlib.crc32(repr(params).encode("utf-8")))
+
+
+def expected_checksums(background_path, font_path, font_sizes, screen_size):
+    checksums = {"background": source_checksum(background_path, tuple(screen_size), IMAGE_FORMAT)}
+    for size in font_sizes:
+        checksums[f"font_{size}"] = source_checksum(font_path, size, GLYPH_CHARS)
+    return checksums
+
+
+def build_glyph_atlas(font):
+    """Render every glyph white on transparent into one strip, returns (surface, glyphs)"""
+    rendered = []
+    for char in GLYPH_CHARS:
+        surface = font.render(char, True, (255, 255, 255))
+        metrics = font.metrics(char)[0]
+        advance = metrics[4] if metrics else surface.get_width()
+        rendered.append((char, surface, advance))
+
+    atlas = pygame.Surface((sum(s.get_width() for _, s, _ in rendered), font.get_height()), pygame.SRCALPHA)
+    glyphs = {}
+    x = 0
+    for char, surface, advance in rendered:
+        atlas.blit(surface, (x, 0))
+        glyphs[char] = [x, surface.get_width(), advance]
+        x += surface.get_width()
+    return atlas, glyphs
+
+
+def build_bundle(path, background_path, font_path, font_sizes, screen_size):
+    """Write the pre-scaled background and glyph atlases to one bundle file
+
+    Assets whose source file is missing are left out, and the game keeps
+    its fallbacks for them.
+    """
+    checksums = expected_checksums(background_path, font_path, font_sizes, screen_size)
+    entries = {}
+    payloads = []
+    offset = 0
+
+    def add(name, surface, image_format, **extra):
+        nonlocal offset
+        data = pygame.image.tobytes(surface, image_format)
+        entries[name] = dict(extra, offset=offset, length=len(data), size=list(surface.get_size()),
+                             format=image_format, checksum=checksums[name])
+        payloads.append(data)
+        offset += len(data)
+
+    if checksums["background"] is not None:
+        background = pygame.transform.scale(pygame.image.load(background_path), screen_size)
+        add("background", background, IMAGE_FORMAT)
+    for size in font_sizes:
+        if checksums[f"font_{size}"] is not None:
+            font = pygame.font.Font(font_path, size)
+            atlas, glyphs = build_glyph_atlas(font)
+            add(f"font_{size}", atlas, "RGBA", glyphs=glyphs)
+
+    manifest = json.dumps(entries).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(manifest)))
+        f.write(manifest)
+        for data in payloads:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class AtlasFont:
+    """Font-like renderer that assembles text from a glyph atlas
+
+    Only render() is provided, which is all TextCache needs. Text with a
+    character missing from the atlas goes to the real font, opened the
+    first time that happens.
+    """
+
+    def __init__(self, atlas, glyphs, font_path, size):
+        self.atlas = atlas
+        self.glyphs = glyphs
+        self.font_path = font_path
+        self.size = size
+        self.fallback = None
+
+    def render(self, text, antialias, color, background=None):
+        glyphs = self.glyphs
+        if any(char not in glyphs for char in text):
+            if self.fallback is None:
+                self.fallback = pygame.font.Font(self.font_path, self.size)
+            return self.fallback.render(text, antialias, color, background)
+
+        x = 0
+        width = 1
+        for char in text:
+            _, glyph_width, advance = glyphs[char]
+            width = max(width, x + glyph_width)
+            x += advance
+        surface = pygame.Surface((width, self.atlas.get_height()), pygame.SRCALPHA)
+        x = 0
+        for char in text:
+            left, glyph_width, advance = glyphs[char]
+            surface.blit(self.atlas, (x, 0), (left, 0, glyph_width, self.atlas.get_height()))
+            x += advance
+        # Glyphs are white, so multiplying tints them without touching their alpha
+        surface.fill(tuple(color)[:3] + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+        if background is not None:
+            filled = pygame.Surface(surface.get_size())
+            filled.fill(background)
+            filled.blit(surface, (0, 0))
+            return filled
+        return surface
+
+
+class AssetBundle:
+    """Read-only view of a bundle file; surfaces point straight into the mapping"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, manifest_size = BUNDLE_HEADER.unpack_from(self.map)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f"{path} is not an asset bundle")
+        start = BUNDLE_HEADER.size
+        self.entries = json.loads(self.map[start:start + manifest_size].decode("utf-8"))
+        self.data_start = start + manifest_size
+        self.view = memoryview(self.map)
+
+    def is_current(self, checksums):
+        for name, checksum in checksums.items():
+            entry = self.entries.get(name)
+            if (entry["checksum"] if entry else None) != checksum:
+                return False
+        return True
+
+    def image(self, name):
+        """Surface over the bundled pixels, or None if the asset is not in the bundle"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        start = self.data_start + entry["offset"]
+        return pygame.image.frombuffer(self.view[start:start + entry["length"]], entry["size"], entry["format"])
+
+    def font(self, name, font_path, size):
+        atlas = self.image(name)
+        if atlas is None:
+            return None
+        return AtlasFont(atlas, self.entries[name]["glyphs"], font_path, size)
+
+
+def load_bundle(path, background_path, font_path, font_sizes, screen_size):
+    """Map the bundle at path, rebuilding it first if it is missing or any source changed"""
+    checksums = expected_checksums(background_path, font_path, font_sizes, screen_size)
+    try:
+        bundle = AssetBundle(path)
+        if bundle.is_current(checksums):
+            return bundle
+    except (OSError, ValueError, struct.error):
+        pass
+    build_bundle(path, background_path, font_path, font_sizes, screen_size)
+    return AssetBundle(path)
+
+
+def main():
+    from pygame_based import BACKGROUND_PATH, BUNDLE_PATH, FONT_PATH, FONT_SIZES, SCREEN_HEIGHT, SCREEN_WIDTH
+
+    parser = argparse.ArgumentParser(description="Build the Ninja Number Slash asset bundle")
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    args = parser.parse_args()
+
+    pygame.font.init()
+    build_bundle(args.output, BACKGROUND_PATH, FONT_PATH, FONT_SIZES, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    bundle = AssetBundle(args.output)
+    print(f"✓ Wrote {args.output}: {', '.join(bundle.entries)} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pygame
+
+from asset_bundle import load_bundle
+
+
+class AssetLoader:
+    """Maps the asset bundle, or decodes the sources directly, on a worker thread
+
+    Nothing here touches the display, so the game keeps drawing with its
+    placeholders and picks the results up once ready() is true.
+    """
+
+    def __init__(self, background_path, font_path, font_sizes, screen_size, bundle_path=None):
+        self.background_path = background_path
+        self.font_path = font_path
+        self.font_sizes = font_sizes
+        self.screen_size = screen_size
+        self.bundle_path = bundle_path
+
+        self.bundle = None
+        self.background = None
+        self.fonts = {}
+        self.messages = []
+        self.error = None
+        self.load_seconds = 0.0
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            if self.bundle_path is not None:
+                try:
+                    self.load_from_bundle()
+                except Exception as e:
+                    # A stale or partly written bundle can fail in the struct or mmap code too
+                    self.messages.append(f"⚠ Asset bundle unavailable ({e}), loading assets directly")
+                    self.bundle = None
+                    self.background = None
+                    self.fonts = {}
+            if self.bundle is None:
+                self.load_from_sources()
+        except Exception as e:
+            self.error = e
+            self.messages.append(f"⚠ Asset loading failed ({e!r}), keeping the default look")
+        finally:
+            # Set whatever happened, so wait() and the game never block on a dead loader
+            self.load_seconds = time.perf_counter() - start
+            self.done.set()
+
+    def load_from_bundle(self):
+        self.bundle = load_bundle(self.bundle_path, self.background_path, self.font_path,
+                                  self.font_sizes, self.screen_size)
+        self.background = self.bundle.image("background")
+        for size in self.font_sizes:
+            font = self.bundle.font(f"font_{size}", self.font_path, size)
+            if font is not None:
+                self.fonts[size] = font
+        self.messages.append(f"✓ Assets mapped from {self.bundle_path}")
+
+    def load_from_sources(self):
+        try:
+            image = pygame.image.load(self.background_path)
+            self.background = pygame.transform.scale(image, self.screen_size)
+            self.messages.append("✓ Background image loaded successfully")
+        except (pygame.error, OSError):
+            self.messages.append("⚠ Background image not found, using gradient background")
+
+        try:
+            self.fonts = {size: pygame.font.Font(self.font_path, size) for size in self.font_sizes}
+            self.messages.append("✓ Custom ninja font loaded successfully")
+        except (pygame.error, OSError):
+            self.fonts = {}
+            self.messages.append("⚠ Custom font not found, using default fonts")
+
+    def ready(self):
+        return self.done.is_set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
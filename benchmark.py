@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# The dummy drivers have to be selected before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from pygame_based import NinjaNumberSlashGame
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(frame_times):
+    ordered = sorted(frame_times)
+    total = sum(ordered)
+    return {
+        "frames": len(ordered),
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "fps": len(ordered) / total if total else 0.0,
+    }
+
+
+def press(key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+class FrameRecorder:
+    def __init__(self, game):
+        self.game = game
+        self.frame_times = {}
+
+    def frame(self):
+        state = self.game.game_state
+        start = time.perf_counter()
+        self.game.step()
+        self.frame_times.setdefault(state, []).append(time.perf_counter() - start)
+
+    def frames(self, count):
+        for _ in range(count):
+            self.frame()
+
+
+def run_script(game, screen_frames, answer_every, max_game_frames):
+    """Menu -> instructions -> menu -> two-level game -> game over -> menu"""
+    recorder = FrameRecorder(game)
+
+    recorder.frames(screen_frames)
+    press(pygame.K_i)
+    recorder.frames(screen_frames)
+    press(pygame.K_ESCAPE)
+    recorder.frames(screen_frames)
+
+    press(pygame.K_SPACE)
+    recorder.frame()
+    frames = 0
+    while game.game_state == "game" and frames < max_game_frames:
+        if frames % answer_every == 0:
+            press(pygame.K_SPACE if (frames // answer_every) % 2 == 0 else pygame.K_d)
+        recorder.frame()
+        frames += 1
+    if game.game_state != "game_over":
+        raise RuntimeError(f"Game did not finish within {max_game_frames} frames")
+
+    recorder.frames(screen_frames)
+    press(pygame.K_SPACE)
+    recorder.frame()
+    return recorder.frame_times
+
+
+def measure_idle(game, seconds):
+    """CPU and wakeups while the main loop sits on the menu with no input"""
+    game.power.start()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        game.run_frame()
+    return game.power.summary()
+
+
+def compare(results, baseline):
+    print(f"{'state':<14}{'p95 ms':>10}{'baseline':>10}{'change':>9}")
+    for state, stats in results["states"].items():
+        old = baseline.get("states", {}).get(state)
+        if not old or not old["p95_ms"]:
+            continue
+        change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+        print(f"{state:<14}{stats['p95_ms']:>10.2f}{old['p95_ms']:>10.2f}{change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for Ninja Number Slash")
+    parser.add_argument("--screen-frames", type=int, default=300,
+                        help="frames to spend on each static screen")
+    parser.add_argument("--level-seconds", type=float, default=5.0,
+                        help="time limit per level during the scripted game")
+    parser.add_argument("--answer-every", type=int, default=10,
+                        help="frames between scripted answers")
+    parser.add_argument("--render-mode", choices=["full", "dirty", "scaled"], default="full",
+                        help="full-screen flips, dirty-rectangle updates or dynamic resolution")
+    parser.add_argument("--idle-seconds", type=float, default=3.0,
+                        help="time to leave the menu idle afterwards to measure CPU and wakeups")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    # Paths given on the command line are the caller's, so they are read or resolved before
+    # the chdir that lets the game find its assets; --output and --baseline may name one file
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        score_path = os.path.join(tmp, "scores.db")
+        game = NinjaNumberSlashGame(score_path=score_path, render_mode=args.render_mode,
+                                    telemetry_path=os.path.join(tmp, "telemetry.bin"))
+        game.time_limit = args.level_seconds
+        game.step()
+        first_frame_ms = game.first_frame_ms
+        # Time the real assets, not the placeholders drawn while they load
+        game.wait_for_assets()
+        max_game_frames = int(args.level_seconds * 2 * 10000)
+        frame_times = run_script(game, args.screen_frames, args.answer_every, max_game_frames)
+        input_latency = game.input_latency.summary()
+        idle = measure_idle(game, args.idle_seconds)
+        audio_buffer_ms = game.sound.latency_ms()
+        game.scores.close()
+        game.telemetry.close()
+        game.sound.close()
+        pygame.quit()
+
+    all_frames = [t for times in frame_times.values() for t in times]
+    results = {
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+        "render_mode": args.render_mode,
+        "render_scale": game.render_scale,
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "startup": {"first_frame_ms": first_frame_ms, "assets_ready_ms": game.assets_ready_ms},
+        "states": {state: summarize(times) for state, times in frame_times.items()},
+        "overall": summarize(all_frames),
+        "input_latency": input_latency,
+        "idle": idle,
+        "audio": {"driver": os.environ["SDL_AUDIODRIVER"], "buffer_ms": audio_buffer_ms},
+    }
+
+    print(json.dumps(results, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
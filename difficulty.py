@@ -0,0 +1,145 @@
+import random
+from bisect import bisect
+from itertools import accumulate
+
+from number_properties import MAX_NUMBER
+from question_stream import make_sampler
+
+NUMBER_BANDS = 65
+MIN_REACH = -1
+MAX_REACH = 3
+REACH_COOLDOWN = 5
+
+
+def number_band(n):
+    """Bands double in width: 1, 2-3, 4-7, 8-15, ..."""
+    return min(n.bit_length(), NUMBER_BANDS - 1)
+
+
+class DifficultyEngine:
+    """Adapts each question to the player from running answer statistics
+
+    Accuracy and response time are kept as exponentially weighted averages
+    per property and per number band, so recording an answer costs the same
+    time and memory however long the game runs. The level config is the
+    starting point: its range is doubled or halved by the player's reach,
+    weak properties come up more often and the time per question follows
+    the player's pace.
+
+    Samplers are shared per property and range across games, and each
+    number is drawn straight from the engine's random.Random, which is
+    reseeded rather than rebuilt for every game. The adjusted config is
+    cached and only the parts an answer can change are recomputed.
+    """
+
+    def __init__(self, alpha=0.2, target_accuracy=0.8, cache_dir=None):
+        self.alpha = alpha
+        self.target_accuracy = target_accuracy
+        self.cache_dir = cache_dir
+        self.rng = random.Random()
+        self.reset()
+
+    def reset(self, seed=None):
+        self.rng.seed(seed)
+        self.seed = seed
+        self.base = None
+        self.derived = None
+        self.changed_property = None
+        # Averages start on target so nothing moves until there is evidence
+        self.property_accuracy = {}
+        self.property_latency = {}
+        self.band_accuracy = [self.target_accuracy] * NUMBER_BANDS
+        self.accuracy = self.target_accuracy
+        self.latency = None
+        self.reach = 0
+        self.since_reach_change = 0
+
+    def record(self, number, property_type, correct, latency):
+        alpha = self.alpha
+        hit = 1.0 if correct else 0.0
+        self.accuracy += alpha * (hit - self.accuracy)
+        self.latency = latency if self.latency is None else self.latency + alpha * (latency - self.latency)
+
+        accuracy = self.property_accuracy.get(property_type, self.target_accuracy)
+        self.property_accuracy[property_type] = accuracy + alpha * (hit - accuracy)
+        previous = self.property_latency.get(property_type, latency)
+        self.property_latency[property_type] = previous + alpha * (latency - previous)
+
+        band = number_band(number)
+        self.band_accuracy[band] += alpha * (hit - self.band_accuracy[band])
+        self.since_reach_change += 1
+        self.changed_property = property_type
+
+    def time_per_question(self, base):
+        if self.latency is None:
+            return base
+        # About twice the player's pace, with extra slack while they miss the target
+        seconds = 2 * self.latency * (1 + max(0.0, self.target_accuracy - self.accuracy))
+        return round(min(max(seconds, 0.6 * base), 1.5 * base), 1)
+
+    def adjust_reach(self, base_high, time_per_question):
+        if self.since_reach_change < REACH_COOLDOWN:
+            return
+        top_accuracy = self.band_accuracy[number_band(self.scaled_high(base_high))]
+        fast = self.latency is not None and self.latency < 0.5 * time_per_question
+        if top_accuracy >= 0.9 and fast and self.reach < MAX_REACH:
+            self.reach += 1
+            self.since_reach_change = 0
+        elif top_accuracy < 0.6 and self.reach > MIN_REACH:
+            self.reach -= 1
+            self.since_reach_change = 0
+
+    def scaled_high(self, base_high):
+        if self.reach >= 0:
+            return min(MAX_NUMBER, base_high << self.reach)
+        return max(2, base_high >> -self.reach)
+
+    def weight(self, property_type):
+        # Weak properties come up up to three times as often as mastered ones
+        return 1.5 - self.property_accuracy.get(property_type, self.target_accuracy)
+
+    def config(self, base):
+        """The level config adjusted to the player
+
+        The returned dict is reused between questions and only updated for
+        what the last answer changed, so callers must not keep it.
+        """
+        low, high = base["number_range"]
+        config = self.derived
+        if config is None or base != self.base:
+            self.base = base
+            properties = base["properties"]
+            time_per_question = self.time_per_question(base["time_per_question"])
+            self.adjust_reach(high, time_per_question)
+            weights = [self.weight(p) for p in properties]
+            config = self.derived = {
+                "properties": properties,
+                "number_range": (low, max(low + 1, self.scaled_high(high))),
+                "time_per_question": time_per_question,
+                "weights": weights,
+                "cum_weights": list(accumulate(weights)),
+            }
+        elif self.changed_property is not None:
+            # Only an answer moves the averages, and it moves one property's weight
+            config["time_per_question"] = self.time_per_question(base["time_per_question"])
+            reach = self.reach
+            self.adjust_reach(high, config["time_per_question"])
+            if self.reach != reach:
+                config["number_range"] = (low, max(low + 1, self.scaled_high(high)))
+            properties = config["properties"]
+            if self.changed_property in properties:
+                weights = config["weights"]
+                weights[properties.index(self.changed_property)] = self.weight(self.changed_property)
+                config["cum_weights"] = list(accumulate(weights))
+        self.changed_property = None
+        return config
+
+    def next_question(self, base):
+        """Return (number, property, config) for the next question of a level"""
+        config = self.config(base)
+        # What rng.choices does with cum_weights, without its per-call setup
+        cum_weights = config["cum_weights"]
+        properties = config["properties"]
+        property_type = properties[bisect(cum_weights, self.rng.random() * cum_weights[-1], 0, len(properties) - 1)]
+        number = make_sampler(property_type, config["number_range"], self.cache_dir).draw(self.rng)
+        return number, property_type, config
@@ -0,0 +1,201 @@
+import random
+import time
+
+from difficulty import DifficultyEngine
+from number_properties import (PREDICATES, get_property_index, is_even, is_fibonacci, is_multiple_of_3,
+                               is_perfect_square, is_prime)
+
+RECORDING_VERSION = 5
+
+LEVEL_CONFIGS = {
+    1: {
+        "properties": ["prime", "even", "multiple_of_3"],
+        "number_range": (1, 50),
+        "time_per_question": 5
+    },
+    2: {
+        "properties": ["prime", "perfect_square", "fibonacci", "multiple_of_3"],
+        "number_range": (1, 100),
+        "time_per_question": 4
+    },
+}
+# Expert levels ask about 10-12 and then 13-18 digit numbers
+EXPERT_LEVEL_CONFIGS = {
+    1: {
+        "properties": ["prime", "even", "multiple_of_3", "perfect_square"],
+        "number_range": (10 ** 9, 10 ** 12 - 1),
+        "time_per_question": 8
+    },
+    2: {
+        "properties": ["prime", "perfect_square", "fibonacci", "multiple_of_3"],
+        "number_range": (10 ** 12, 10 ** 18 - 1),
+        "time_per_question": 7
+    },
+}
+LEVEL_POINTS = {1: 10, 2: 15}
+WRONG_PENALTY = 5
+
+
+def level_config(level, expert=False):
+    configs = EXPERT_LEVEL_CONFIGS if expert else LEVEL_CONFIGS
+    return dict(configs[1 if level == 1 else 2])
+
+
+class NinjaGameLogic:
+    """Rules of the pygame game without any rendering
+
+    All timing goes through time_source and all randomness through rng, so
+    a game replays exactly from its seed and input log.
+    """
+
+    def __init__(self, time_source=time.time, rng=None):
+        self.time_source = time_source
+        self.rng = rng if rng is not None else random.Random()
+
+        self.game_state = "menu"
+        self.score = 0
+        self.high_score = 0
+        self.level = 1
+        self.expert = False
+        self.time_limit = 30
+        self.correct_answers = 0
+        self.total_questions = 0
+        self.current_property = ""
+        self.current_number = 0
+        self.current_range = (1, 50)
+        self.property_cache_dir = None
+        self.difficulty = DifficultyEngine()
+
+        self.level_start_time = 0
+        self.question_start_time = 0
+        self.time_left = self.time_limit
+        self.time_per_question = 5
+        self.question_time_left = self.time_per_question
+        self.last_latency = 0.0
+
+        self.game_seed = 0
+        self.game_start_time = 0
+        self.answer_time = 0
+        self.input_log = []
+
+    def is_prime(self, n):
+        return is_prime(n)
+
+    def is_perfect_square(self, n):
+        return is_perfect_square(n)
+
+    def is_multiple_of_3(self, n):
+        return is_multiple_of_3(n)
+
+    def is_fibonacci(self, n):
+        return is_fibonacci(n)
+
+    def is_even(self, n):
+        return is_even(n)
+
+    def check_property(self, number, property_type):
+        index = get_property_index(self.current_range, self.property_cache_dir)
+        if index is not None and index.covers(number) and property_type in index:
+            return index.lookup(number, property_type)
+        predicate = PREDICATES.get(property_type)
+        return predicate(number) if predicate is not None else False
+
+    def get_level_config(self):
+        return level_config(self.level, self.expert)
+
+    def get_property_description(self, property_type):
+        descriptions = {
+            "prime": "Prime Number",
+            "even": "Even Number",
+            "multiple_of_3": "Multiple of 3",
+            "perfect_square": "Perfect Square",
+            "fibonacci": "Fibonacci Number"
+        }
+        return descriptions.get(property_type, "Unknown")
+
+    def generate_question(self, now=None):
+        self.current_number, self.current_property, config = self.difficulty.next_question(self.get_level_config())
+        self.current_range = config["number_range"]
+        self.time_per_question = config["time_per_question"]
+        self.question_start_time = self.time_source() if now is None else now
+
+    def handle_answer(self, user_answer):
+        """Score one answer, returns whether it was correct"""
+        correct_answer = self.check_property(self.current_number, self.current_property)
+        self.total_questions += 1
+        # Measured against the logged answer time so a replay sees the same latency
+        self.last_latency = self.answer_time - self.question_start_time
+        correct = user_answer == correct_answer
+        self.difficulty.record(self.current_number, self.current_property, correct, self.last_latency)
+
+        if correct:
+            self.correct_answers += 1
+            self.score += LEVEL_POINTS[1 if self.level == 1 else 2]
+            return True
+        self.score = max(0, self.score - WRONG_PENALTY)
+        return False
+
+    def start_new_game(self, seed=None):
+        self.game_seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.difficulty.cache_dir = self.property_cache_dir
+        self.difficulty.reset(self.game_seed)
+        self.input_log = []
+        self.score = 0
+        self.correct_answers = 0
+        self.total_questions = 0
+        self.level = 1
+        self.game_start_time = self.time_source()
+        self.level_start_time = self.game_start_time
+        self.time_left = self.time_limit
+        self.game_state = "game"
+        self.generate_question(self.game_start_time)
+
+    def submit_answer(self, user_answer):
+        """Apply a player's answer at the current time and move to the next question"""
+        now = self.time_source()
+        self.update(now)
+        if self.game_state != "game":
+            return
+        self.input_log.append((now, user_answer))
+        self.answer_time = now
+        self.handle_answer(user_answer)
+        self.generate_question(now)
+
+    def update(self, now=None):
+        if self.game_state != "game":
+            return
+        if now is None:
+            now = self.time_source()
+        # Like the terminal game, a question left unanswered for time_per_question gives way to the
+        # next. Each one starts at the last one's deadline, so a replay sees the same questions
+        deadline = self.question_start_time + self.time_per_question
+        while deadline <= now and deadline - self.level_start_time < self.time_limit:
+            self.generate_question(deadline)
+            deadline = self.question_start_time + self.time_per_question
+        self.question_time_left = deadline - now
+        self.time_left = self.time_limit - (now - self.level_start_time)
+        if self.time_left <= 0:
+            if self.level == 1:
+                # Level 2 starts where level 1 ended, not when the timeout was noticed
+                self.level = 2
+                self.level_start_time += self.time_limit
+                self.generate_question(self.level_start_time)
+                self.update(now)
+            else:
+                self.game_state = "game_over"
+                self.on_game_over()
+
+    def on_game_over(self):
+        pass
+
+    def recording(self):
+        """Everything needed to replay the last game"""
+        return {
+            "version": RECORDING_VERSION,
+            "seed": self.game_seed,
+            "expert": self.expert,
+            "time_limit": self.time_limit,
+            "start_time": self.game_start_time,
+            "inputs": [[t, answer] for t, answer in self.input_log],
+            "score": self.score,
+        }
@@ -0,0 +1,65 @@
+import time
+
+BUCKET_MS = 0.25
+MAX_LATENCY_MS = 1000
+
+
+class InputLatencyTracker:
+    """Time from an answer input arriving to handle_answer and to the first frame that shows it
+
+    SDL doesn't timestamp inputs, so each is counted from the poll of the
+    event queue before the one that picked it up. Time spent queued counts
+    in full, and the figures are high by at most one frame.
+    Latencies go into fixed BUCKET_MS histogram buckets, so the tracker
+    stays the same size however long the game runs.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.pending = []
+        buckets = int(MAX_LATENCY_MS / BUCKET_MS) + 1
+        self.histograms = {"handled": [0] * buckets, "displayed": [0] * buckets}
+        self.worst = {"handled": 0.0, "displayed": 0.0}
+
+    def add(self, stage, seconds):
+        ms = seconds * 1000
+        self.worst[stage] = max(self.worst[stage], ms)
+        self.histograms[stage][min(int(ms / BUCKET_MS), len(self.histograms[stage]) - 1)] += 1
+
+    def input_handled(self, arrived_at):
+        self.add("handled", self.clock() - arrived_at)
+        self.pending.append(arrived_at)
+
+    def frame_presented(self):
+        if not self.pending:
+            return
+        now = self.clock()
+        for arrived_at in self.pending:
+            self.add("displayed", now - arrived_at)
+        self.pending = []
+
+    def count(self):
+        return sum(self.histograms["displayed"])
+
+    @staticmethod
+    def percentile(histogram, fraction):
+        total = sum(histogram)
+        if not total:
+            return 0.0
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if seen >= fraction * total:
+                return (bucket + 1) * BUCKET_MS
+        return len(histogram) * BUCKET_MS
+
+    def summary(self):
+        rows = {"inputs": self.count()}
+        for stage, histogram in self.histograms.items():
+            rows[stage] = {
+                "p50_ms": self.percentile(histogram, 0.50),
+                "p95_ms": self.percentile(histogram, 0.95),
+                "p99_ms": self.percentile(histogram, 0.99),
+                "max_ms": self.worst[stage],
+            }
+        return rows
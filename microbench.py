@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from game_logic import NinjaGameLogic
+from number_properties import MAX_NUMBER
+from replay import ReplayClock, replay
+from score_store import ScoreStore
+from telemetry import TelemetryWriter
+from terminal_based import NinjaNumberSlash
+
+RANGES = [(1, 100), (1, 10 ** 4), (1, 10 ** 6), (1, 10 ** 9), (1, MAX_NUMBER)]
+PREDICATES = ["is_prime", "is_perfect_square", "is_fibonacci"]
+SAMPLE_SIZE = 1000
+REPLAY_GAMES = 50
+# Auditing submitted scores needs replay at thousands of games a second
+REPLAY_TARGET = 1000
+
+
+def range_name(number_range):
+    if number_range[1] == MAX_NUMBER:
+        return "2^64"
+    return f"1e{len(str(number_range[1])) - 1}"
+
+
+def measure(func, min_time):
+    """Calls per second of func(), timed in growing batches until min_time has passed"""
+    calls = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            func()
+        calls += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+        batch *= 2
+
+
+def peak_memory(func, calls):
+    """Peak bytes Python allocated while making calls calls of func()"""
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def cycle(values):
+    """Callable returning the next value on each call, round and round"""
+    position = [0]
+
+    def next_value():
+        i = position[0]
+        position[0] = (i + 1) % len(values)
+        return values[i]
+    return next_value
+
+
+class FixedRange:
+    """Mixin that pins a game's level config to one number range"""
+
+    number_range = (1, 100)
+
+    def get_level_config(self):
+        config = super().get_level_config()
+        config["number_range"] = self.number_range
+        return config
+
+
+class BenchLogic(FixedRange, NinjaGameLogic):
+    pass
+
+
+class BenchTerminal(FixedRange, NinjaNumberSlash):
+    pass
+
+
+def make_games(tmp):
+    logic = BenchLogic(time_source=time.perf_counter)
+    terminal = BenchTerminal(ScoreStore(os.path.join(tmp, "scores.db"), legacy_path=None),
+                             TelemetryWriter(os.path.join(tmp, "telemetry.bin")))
+    return {"game_logic": logic, "terminal_based": terminal}
+
+
+def cases(games, number_range, numbers):
+    """(name, callable) for every operation that makes sense in this range"""
+    logic = games["game_logic"]
+    terminal = games["terminal_based"]
+    for module, game in games.items():
+        game.number_range = number_range
+        game.current_range = number_range
+        for predicate in PREDICATES:
+            yield f"{module}.{predicate}", lambda f=getattr(game, predicate), n=cycle(numbers): f(n())
+        properties = cycle(game.get_level_config()["properties"])
+        yield f"{module}.check_property", lambda g=game, n=cycle(numbers), p=properties: g.check_property(n(), p())
+
+    logic.start_new_game(seed=0)
+    yield "game_logic.generate_question", logic.generate_question
+    yield "game_logic.handle_answer", lambda: logic.handle_answer(True)
+    terminal.difficulty.reset(0)
+    terminal.next_question()
+    yield "terminal_based.next_question", terminal.next_question
+    yield "terminal_based.score_answer", lambda: terminal.score_answer(terminal.current_range[0], True, 0.5)
+
+
+def make_recordings(count):
+    """Recordings of games by a player who answers every 0.4-2.4 s and is right 85% of the time"""
+    rng = random.Random(0)
+    recordings = []
+    for _ in range(count):
+        clock = ReplayClock()
+        logic = NinjaGameLogic(time_source=clock)
+        logic.start_new_game(seed=rng.getrandbits(64))
+        while logic.game_state == "game":
+            clock.now += rng.uniform(0.4, 2.4)
+            right = logic.check_property(logic.current_number, logic.current_property)
+            logic.submit_answer(right if rng.random() < 0.85 else not right)
+        recordings.append(logic.recording())
+    return recordings
+
+
+def replay_case(recordings):
+    """Callable replaying the next recording on each call, so ops/s is games/s"""
+    next_recording = cycle(recordings)
+    logic = replay(next_recording())
+    return lambda: replay(next_recording(), logic)
+
+
+def run_suite(min_time, memory_calls):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        games = make_games(tmp)
+        for number_range in RANGES:
+            rng = random.Random(0)
+            numbers = [rng.randint(*number_range) for _ in range(SAMPLE_SIZE)]
+            for name, func in cases(games, number_range, numbers):
+                func()  # builds any index or stream outside the timing
+                results[f"{name}[{range_name(number_range)}]"] = {
+                    "ops_per_sec": measure(func, min_time),
+                    "peak_kib": peak_memory(func, memory_calls) / 1024,
+                }
+        games["terminal_based"].scores.close()
+        games["terminal_based"].telemetry.close()
+
+    func = replay_case(make_recordings(REPLAY_GAMES))
+    results["replay.replay[games]"] = {
+        "ops_per_sec": measure(func, min_time),
+        "peak_kib": peak_memory(func, memory_calls) / 1024,
+    }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each benchmark against the baseline, returns the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':<44}{'ops/s':>14}{'baseline':>14}{'change':>9}")
+    for name, stats in results.items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if not old or not old["ops_per_sec"]:
+            continue
+        change = (stats["ops_per_sec"] - old["ops_per_sec"]) / old["ops_per_sec"]
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  ✗"
+        print(f"{name:<44}{stats['ops_per_sec']:>14.0f}{old['ops_per_sec']:>14.0f}{change * 100:>+8.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the game predicates and question flow")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to time each benchmark for")
+    parser.add_argument("--memory-calls", type=int, default=200, help="calls traced for peak memory")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fail when ops/s drops by more than this fraction of the baseline")
+    parser.add_argument("--replay-target", type=float, default=REPLAY_TARGET,
+                        help="fail when replay runs fewer games per second than this")
+    args = parser.parse_args()
+
+    # Read before anything is written, so --output and --baseline can name the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {
+        "python": sys.version.split()[0],
+        "benchmarks": run_suite(args.min_time, args.memory_calls),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    if baseline is None:
+        print(f"{'benchmark':<44}{'ops/s':>14}{'peak KiB':>10}")
+        for name, stats in results["benchmarks"].items():
+            print(f"{name:<44}{stats['ops_per_sec']:>14.0f}{stats['peak_kib']:>10.1f}")
+    else:
+        regressions = compare(results["benchmarks"], baseline, args.threshold)
+        if regressions:
+            print(f"✗ {len(regressions)} benchmark(s) regressed by more than {args.threshold * 100:.0f}%")
+            failed = True
+
+    games_per_sec = results["benchmarks"]["replay.replay[games]"]["ops_per_sec"]
+    if games_per_sec < args.replay_target:
+        print(f"✗ Replay ran {games_per_sec:.0f} games/s, under the {args.replay_target:.0f} games/s target")
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+import argparse
+import asyncio
+import collections
+import random
+import struct
+import threading
+import time
+
+from game_logic import LEVEL_CONFIGS, LEVEL_POINTS, WRONG_PENALTY
+from number_properties import PROPERTY_NAMES
+from question_stream import QuestionStream
+from score_store import ScoreStore
+
+# Every message is a little-endian (body length, type) header and a body
+MESSAGE_HEADER = struct.Struct("<HB")
+HELLO = 1
+ANSWER = 2
+WELCOME = 10
+STATE = 11
+
+ANSWER_BODY = struct.Struct("<IB")
+WELCOME_BODY = struct.Struct("<HI")
+
+# A STATE body is a field mask followed by the fields it names, in this order
+FIELD_PHASE = 1
+FIELD_QUESTION = 2
+FIELD_TIMER = 4
+FIELD_SCORES = 8
+FIELD_ROSTER = 16
+FIELD_RESULTS = 32
+ALL_FIELDS = 63
+
+PHASE = struct.Struct("<B")
+QUESTION = struct.Struct("<IQB")
+TIMER = struct.Struct("<BI")
+COUNT = struct.Struct("<H")
+SCORE = struct.Struct("<Hi")
+ROSTER_ENTRY = struct.Struct("<HBB")
+RESULT = struct.Struct("<IHB")
+
+PHASES = ["waiting", "countdown", "game", "game_over"]
+MAX_NAME_BYTES = 32
+
+TICK_SECONDS = 0.05
+TIMER_SYNC_SECONDS = 1.0
+MAX_WRITE_BUFFER = 1 << 20
+
+
+def message(kind, body=b""):
+    return MESSAGE_HEADER.pack(len(body), kind) + body
+
+
+async def read_message(reader):
+    """Next (type, body) from the stream; raises IncompleteReadError at EOF"""
+    length, kind = MESSAGE_HEADER.unpack(await reader.readexactly(MESSAGE_HEADER.size))
+    return kind, await reader.readexactly(length)
+
+
+def encode_state(mask, phase=None, question=None, timer=None, scores=(), roster=(), results=()):
+    """Pack the fields named in mask; the rest are not sent"""
+    parts = [PHASE.pack(mask)]
+    if mask & FIELD_PHASE:
+        parts.append(PHASE.pack(PHASES.index(phase)))
+    if mask & FIELD_QUESTION:
+        parts.append(QUESTION.pack(*question))
+    if mask & FIELD_TIMER:
+        level, time_left = timer
+        parts.append(TIMER.pack(level, max(0, int(time_left * 1000))))
+    if mask & FIELD_SCORES:
+        parts.append(COUNT.pack(len(scores)))
+        parts.extend(SCORE.pack(player_id, score) for player_id, score in scores)
+    if mask & FIELD_ROSTER:
+        parts.append(COUNT.pack(len(roster)))
+        for player_id, active, name in roster:
+            encoded = name.encode("utf-8")[:MAX_NAME_BYTES]
+            parts.append(ROSTER_ENTRY.pack(player_id, active, len(encoded)) + encoded)
+    if mask & FIELD_RESULTS:
+        parts.append(COUNT.pack(len(results)))
+        parts.extend(RESULT.pack(*result) for result in results)
+    return message(STATE, b"".join(parts))
+
+
+def decode_state(body):
+    """Inverse of encode_state, returns a dict holding only the fields that were sent"""
+    mask = body[0]
+    offset = 1
+    fields = {}
+    if mask & FIELD_PHASE:
+        fields["phase"] = PHASES[body[offset]]
+        offset += PHASE.size
+    if mask & FIELD_QUESTION:
+        fields["question"] = QUESTION.unpack_from(body, offset)
+        offset += QUESTION.size
+    if mask & FIELD_TIMER:
+        level, time_left_ms = TIMER.unpack_from(body, offset)
+        fields["timer"] = (level, time_left_ms / 1000)
+        offset += TIMER.size
+    if mask & FIELD_SCORES:
+        (count,) = COUNT.unpack_from(body, offset)
+        offset += COUNT.size
+        fields["scores"] = [SCORE.unpack_from(body, offset + i * SCORE.size) for i in range(count)]
+        offset += count * SCORE.size
+    if mask & FIELD_ROSTER:
+        (count,) = COUNT.unpack_from(body, offset)
+        offset += COUNT.size
+        roster = []
+        for _ in range(count):
+            player_id, active, length = ROSTER_ENTRY.unpack_from(body, offset)
+            offset += ROSTER_ENTRY.size
+            roster.append((player_id, bool(active), body[offset:offset + length].decode("utf-8", "replace")))
+            offset += length
+        fields["roster"] = roster
+    if mask & FIELD_RESULTS:
+        (count,) = COUNT.unpack_from(body, offset)
+        offset += COUNT.size
+        fields["results"] = [RESULT.unpack_from(body, offset + i * RESULT.size) for i in range(count)]
+    return fields
+
+
+class Player:
+    def __init__(self, player_id, name, writer):
+        self.player_id = player_id
+        self.name = name
+        self.writer = writer
+        self.active = True
+        self.score = 0
+        self.correct_answers = 0
+        self.total_questions = 0
+
+
+class Match:
+    """One authoritative game shared by up to max_players clients
+
+    Everyone gets the same question. The first correct answer to reach the
+    server takes the points and moves the match on; a wrong answer costs
+    the usual penalty and locks that player out of the question. Each tick
+    broadcasts one STATE message with only what changed since the last.
+    """
+
+    def __init__(self, server, match_id, seed=None):
+        self.server = server
+        self.match_id = match_id
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.players = {}
+        self.phase = "waiting"
+        self.phase_end = 0.0
+        self.level = 1
+        self.question = None
+        self.question_id = 0
+        self.question_end = 0.0
+        self.answered = set()
+        self.streams = {}
+
+        self.dirty = 0
+        self.dirty_scores = set()
+        self.dirty_roster = set()
+        self.results = []
+        self.last_timer_sync = 0.0
+        self.task = None
+
+    def open(self):
+        return self.phase in ("waiting", "countdown") and len(self.players) < self.server.max_players
+
+    def time_left(self, now):
+        return max(0.0, self.phase_end - now)
+
+    def add_player(self, name, writer):
+        player = Player(len(self.players), name, writer)
+        self.players[player.player_id] = player
+        self.dirty_roster.add(player.player_id)
+        self.dirty_scores.add(player.player_id)
+        writer.write(message(WELCOME, WELCOME_BODY.pack(player.player_id, self.match_id)))
+        writer.write(self.snapshot(time.monotonic()))
+        return player
+
+    def remove_player(self, player):
+        player.active = False
+        self.dirty_roster.add(player.player_id)
+
+    def active_players(self):
+        return [p for p in self.players.values() if p.active]
+
+    def snapshot(self, now):
+        """Full state for a client that just joined"""
+        return encode_state(ALL_FIELDS & ~FIELD_RESULTS, self.phase, self.question_fields(),
+                            (self.level, self.time_left(now)),
+                            [(p.player_id, p.score) for p in self.players.values()],
+                            [(p.player_id, p.active, p.name) for p in self.players.values()])
+
+    def question_fields(self):
+        if self.question is None:
+            return (0, 0, 0)
+        number, property_type, _ = self.question
+        return (self.question_id, number, PROPERTY_NAMES.index(property_type))
+
+    def set_phase(self, phase, duration, now):
+        self.phase = phase
+        self.phase_end = now + duration
+        self.dirty |= FIELD_PHASE | FIELD_TIMER
+
+    def next_question(self, now):
+        config = LEVEL_CONFIGS[self.level]
+        stream = self.streams.get(self.level)
+        if stream is None:
+            stream = QuestionStream(config["properties"], config["number_range"], seed=[self.seed, self.level],
+                                    batch_size=64)
+            self.streams[self.level] = stream
+        self.question = next(stream)
+        self.question_id += 1
+        self.question_end = min(self.phase_end, now + config["time_per_question"])
+        self.answered = set()
+        self.dirty |= FIELD_QUESTION
+
+    def answer(self, player, question_id, user_answer):
+        if self.phase != "game" or question_id != self.question_id or player.player_id in self.answered:
+            return
+        self.answered.add(player.player_id)
+        correct = user_answer == self.question[2]
+        player.total_questions += 1
+        if correct:
+            player.correct_answers += 1
+            player.score += LEVEL_POINTS[self.level]
+        else:
+            player.score = max(0, player.score - WRONG_PENALTY)
+        self.dirty_scores.add(player.player_id)
+        self.results.append((question_id, player.player_id, int(correct)))
+
+        now = time.monotonic()
+        if correct or len(self.answered) >= len(self.active_players()):
+            self.next_question(now)
+
+    def advance(self, now):
+        if self.phase == "waiting":
+            if len(self.active_players()) >= self.server.min_players:
+                self.set_phase("countdown", self.server.countdown, now)
+        elif self.phase == "countdown":
+            if now >= self.phase_end:
+                self.level = 1
+                self.set_phase("game", self.server.time_limit, now)
+                self.next_question(now)
+        elif self.phase == "game":
+            if now >= self.phase_end:
+                if self.level == 1:
+                    self.level = 2
+                    # Level 2 starts where level 1 ended, like the single-player logic
+                    self.set_phase("game", self.server.time_limit, self.phase_end)
+                    self.next_question(now)
+                else:
+                    self.set_phase("game_over", self.server.linger, now)
+                    self.record_scores()
+            elif now >= self.question_end:
+                self.next_question(now)
+        return not (self.phase == "game_over" and now >= self.phase_end) and bool(self.active_players()
+                                                                                   or self.phase == "waiting")
+
+    def record_scores(self):
+        if self.server.scores is None:
+            return
+        for player in self.players.values():
+            self.server.scores.record_game(player.name, player.score, self.level,
+                                           player.correct_answers, player.total_questions)
+
+    def broadcast(self, now):
+        if now - self.last_timer_sync >= TIMER_SYNC_SECONDS:
+            # Clients predict the clock between syncs, this only corrects drift
+            self.dirty |= FIELD_TIMER
+        mask = self.dirty
+        if self.dirty_scores:
+            mask |= FIELD_SCORES
+        if self.dirty_roster:
+            mask |= FIELD_ROSTER
+        if self.results:
+            mask |= FIELD_RESULTS
+        if not mask:
+            return
+        if mask & FIELD_TIMER:
+            self.last_timer_sync = now
+
+        data = encode_state(mask, self.phase, self.question_fields(), (self.level, self.time_left(now)),
+                            [(i, self.players[i].score) for i in sorted(self.dirty_scores)],
+                            [(i, self.players[i].active, self.players[i].name) for i in sorted(self.dirty_roster)],
+                            self.results)
+        self.dirty = 0
+        self.dirty_scores = set()
+        self.dirty_roster = set()
+        self.results = []
+
+        for player in self.active_players():
+            transport = player.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                # A client this far behind would only see stale state, so let it go
+                player.writer.close()
+                continue
+            player.writer.write(data)
+
+    async def run(self):
+        try:
+            while True:
+                now = time.monotonic()
+                keep_running = self.advance(now)
+                self.broadcast(now)
+                if not keep_running:
+                    break
+                await asyncio.sleep(TICK_SECONDS)
+        finally:
+            self.server.matches.pop(self.match_id, None)
+            for player in self.players.values():
+                player.writer.close()
+
+
+class MatchServer:
+    """Hosts many head-to-head matches in one event loop
+
+    New players fill the newest open match; a match that has started, or
+    is full, stops taking players and the next arrival opens a fresh one.
+    """
+
+    def __init__(self, max_players=32, min_players=2, countdown=3.0, time_limit=30, linger=5.0, scores=None):
+        self.max_players = max_players
+        self.min_players = min_players
+        self.countdown = countdown
+        self.time_limit = time_limit
+        self.linger = linger
+        self.scores = scores
+        self.matches = {}
+        self.next_match_id = 1
+
+    def open_match(self):
+        for match in self.matches.values():
+            if match.open():
+                return match
+        match = Match(self, self.next_match_id)
+        self.next_match_id += 1
+        self.matches[match.match_id] = match
+        match.task = asyncio.get_running_loop().create_task(match.run())
+        return match
+
+    async def handle_connection(self, reader, writer):
+        player = None
+        match = None
+        try:
+            kind, body = await read_message(reader)
+            if kind != HELLO:
+                return
+            name = body[:MAX_NAME_BYTES].decode("utf-8", "replace").strip() or "ninja"
+            match = self.open_match()
+            player = match.add_player(name, writer)
+            while True:
+                kind, body = await read_message(reader)
+                if kind == ANSWER:
+                    question_id, user_answer = ANSWER_BODY.unpack(body)
+                    match.answer(player, question_id, bool(user_answer))
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error):
+            pass
+        finally:
+            if player is not None:
+                match.remove_player(player)
+            writer.close()
+
+    async def serve(self, host, port, ready=None):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+class MatchClient:
+    """Client-side mirror of one match
+
+    State deltas are applied as they arrive. time_left() keeps counting
+    down locally between timer syncs, so the display never waits on the
+    network.
+    """
+
+    def __init__(self, name="ninja", clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self.player_id = None
+        self.match_id = None
+        self.phase = "waiting"
+        self.question_id = 0
+        self.number = 0
+        self.property_type = ""
+        self.level = 1
+        self.synced_time_left = 0.0
+        self.synced_at = clock()
+        self.scores = {}
+        self.names = {}
+        self.active = {}
+        self.results = collections.deque()
+        self.connected = False
+        self.reader = None
+        self.writer = None
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(message(HELLO, self.name.encode("utf-8")[:MAX_NAME_BYTES]))
+        self.connected = True
+
+    async def receive_forever(self):
+        try:
+            while True:
+                kind, body = await read_message(self.reader)
+                self.apply(kind, body)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connected = False
+
+    def apply(self, kind, body):
+        if kind == WELCOME:
+            self.player_id, self.match_id = WELCOME_BODY.unpack(body)
+        elif kind == STATE:
+            fields = decode_state(body)
+            if "phase" in fields:
+                self.phase = fields["phase"]
+            if "question" in fields:
+                self.question_id, self.number, property_id = fields["question"]
+                self.property_type = PROPERTY_NAMES[property_id]
+            if "timer" in fields:
+                self.level, self.synced_time_left = fields["timer"]
+                self.synced_at = self.clock()
+            for player_id, score in fields.get("scores", ()):
+                self.scores[player_id] = score
+            for player_id, active, name in fields.get("roster", ()):
+                self.names[player_id] = name
+                self.active[player_id] = active
+            self.results.extend(fields.get("results", ()))
+
+    def time_left(self):
+        return max(0.0, self.synced_time_left - (self.clock() - self.synced_at))
+
+    def score(self):
+        return self.scores.get(self.player_id, 0)
+
+    def standings(self):
+        """(name, score, is_me) for players still connected, best first"""
+        rows = [(self.names.get(i, "?"), score, i == self.player_id)
+                for i, score in self.scores.items() if self.active.get(i, True)]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def answer(self, user_answer):
+        if self.connected and self.phase == "game":
+            self.writer.write(message(ANSWER, ANSWER_BODY.pack(self.question_id, int(user_answer))))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ThreadedMatchClient(MatchClient):
+    """MatchClient running on its own event loop thread, for the pygame frame loop"""
+
+    def __init__(self, host, port, name="ninja"):
+        super().__init__(name)
+        self.loop = asyncio.new_event_loop()
+        self.error = None
+        self.thread = threading.Thread(target=self.run, args=(host, port), name="match-client", daemon=True)
+        self.thread.start()
+
+    def run(self, host, port):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.connect(host, port))
+            self.loop.run_until_complete(self.receive_forever())
+        except OSError as e:
+            self.error = e
+        finally:
+            self.loop.close()
+
+    def answer(self, user_answer):
+        if self.connected:
+            self.loop.call_soon_threadsafe(MatchClient.answer, self, user_answer)
+
+    def close(self):
+        if self.connected:
+            self.loop.call_soon_threadsafe(MatchClient.close, self)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host head-to-head Ninja Number Slash matches")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="interface to listen on; matches are unauthenticated, so only pass "
+                             "0.0.0.0 to open them to the network on purpose")
+    parser.add_argument("--port", type=int, default=8024)
+    parser.add_argument("--max-players", type=int, default=32)
+    parser.add_argument("--min-players", type=int, default=2)
+    parser.add_argument("--countdown", type=float, default=3.0)
+    parser.add_argument("--time-limit", type=float, default=30)
+    parser.add_argument("--scores", help="score database to record finished matches in")
+    args = parser.parse_args()
+
+    scores = None
+    if args.scores:
+        scores = ScoreStore(args.scores, legacy_path=None)
+    server = MatchServer(args.max_players, args.min_players, args.countdown, args.time_limit, scores=scores)
+    print(f"🥷 Match server listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("🥷 Server stopped")
+    finally:
+        if scores is not None:
+            scores.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import math
+import mmap
+import os
+import struct
+
+PROPERTY_NAMES = ["prime", "perfect_square", "fibonacci", "even", "multiple_of_3"]
+
+INDEX_MAGIC = b"NNSI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sIQQ")
+MAX_INDEX_NUMBER = 10 ** 8
+# Largest number the exact predicates, telemetry and network formats all handle
+MAX_NUMBER = 2 ** 64 - 1
+
+SMALL_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+
+
+def is_prime(n):
+    """Deterministic Miller-Rabin; the primes to 37 as bases are exact for every n below 3.18 * 10**23"""
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    shift = 0
+    while d % 2 == 0:
+        d //= 2
+        shift += 1
+    for a in SMALL_PRIMES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(shift - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_perfect_square(n):
+    if n < 0:
+        return False
+    root = math.isqrt(n)
+    return root * root == n
+
+
+def is_fibonacci(n):
+    """n is Fibonacci exactly when 5n^2 + 4 or 5n^2 - 4 is a perfect square"""
+    if n < 0:
+        return False
+    return is_perfect_square(5 * n * n + 4) or is_perfect_square(5 * n * n - 4)
+
+
+def is_even(n):
+    return n % 2 == 0
+
+
+def is_multiple_of_3(n):
+    return n % 3 == 0
+
+
+PREDICATES = {
+    "prime": is_prime,
+    "perfect_square": is_perfect_square,
+    "fibonacci": is_fibonacci,
+    "even": is_even,
+    "multiple_of_3": is_multiple_of_3,
+}
+
+
+def pack_bits(flags):
+    """Pack a bytearray of 0/1 flags into a little-endian bitset"""
+    padding = -len(flags) % 8
+    if padding:
+        flags = flags + bytes(padding)
+    packed = 0
+    # Every flag byte is 0 or 1, so shifting the k-th stride by k never carries
+    for k in range(8):
+        packed |= int.from_bytes(flags[k::8], "little") << k
+    return packed.to_bytes(len(flags) // 8, "little")
+
+
+def sieve_primes(limit):
+    flags = bytearray([1]) * (limit + 1)
+    flags[:2] = bytes(len(flags[:2]))
+    for i in range(2, math.isqrt(limit) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return flags
+
+
+class PropertyIndex:
+    """Bitsets for every game property over the closed range [low, high]"""
+
+    def __init__(self, low, high, bitsets, source=None):
+        self.low = low
+        self.high = high
+        self.bitsets = bitsets
+        self._source = source
+
+    @classmethod
+    def build(cls, low, high):
+        if low < 0 or high < low:
+            raise ValueError(f"Invalid number range ({low}, {high})")
+        if high > MAX_INDEX_NUMBER:
+            raise ValueError(f"Range too large to index: {high} > {MAX_INDEX_NUMBER}")
+
+        size = high - low + 1
+        bitsets = {}
+
+        bitsets["prime"] = pack_bits(sieve_primes(high)[low:])
+
+        flags = bytearray(size)
+        first_root = math.isqrt(low - 1) + 1 if low > 0 else 0
+        for root in range(first_root, math.isqrt(high) + 1):
+            flags[root * root - low] = 1
+        bitsets["perfect_square"] = pack_bits(flags)
+
+        flags = bytearray(size)
+        a, b = 0, 1
+        while a <= high:
+            if a >= low:
+                flags[a - low] = 1
+            a, b = b, a + b
+        bitsets["fibonacci"] = pack_bits(flags)
+
+        pattern = b"\x01\x00" if low % 2 == 0 else b"\x00\x01"
+        bitsets["even"] = pack_bits(bytearray(pattern * (size // 2 + 1))[:size])
+
+        pattern = (b"\x01\x00\x00" * 2)[low % 3:low % 3 + 3]
+        bitsets["multiple_of_3"] = pack_bits(bytearray(pattern * (size // 3 + 1))[:size])
+
+        return cls(low, high, bitsets)
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.low, self.high))
+            for name in PROPERTY_NAMES:
+                f.write(self.bitsets[name])
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Map a saved index from disk without reading it into memory"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < INDEX_HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path} is not a property index")
+        magic, version, low, high = INDEX_HEADER.unpack_from(mapped)
+        stride = (high - low + 1 + 7) // 8
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            mapped.close()
+            raise ValueError(f"{path} is not a property index")
+        if len(mapped) != INDEX_HEADER.size + stride * len(PROPERTY_NAMES):
+            mapped.close()
+            raise ValueError(f"{path} is truncated")
+
+        view = memoryview(mapped)
+        bitsets = {}
+        for i, name in enumerate(PROPERTY_NAMES):
+            start = INDEX_HEADER.size + i * stride
+            bitsets[name] = view[start:start + stride]
+        return cls(low, high, bitsets, source=mapped)
+
+    def covers(self, n):
+        return self.low <= n <= self.high
+
+    def __contains__(self, property_type):
+        return property_type in self.bitsets
+
+    def lookup(self, n, property_type):
+        offset = n - self.low
+        return bool(self.bitsets[property_type][offset >> 3] >> (offset & 7) & 1)
+
+
+_indexes = {}
+
+
+def get_property_index(number_range, cache_dir=None):
+    """Return the shared index for a level range, building it at most once
+
+    With cache_dir set the index is memory-mapped from disk, and built and
+    saved there first if no earlier launch has done so. Ranges reaching past
+    MAX_INDEX_NUMBER return None and callers fall back to the predicates.
+    """
+    low, high = number_range
+    if high > MAX_INDEX_NUMBER:
+        return None
+    key = (low, high)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    if cache_dir is None:
+        index = PropertyIndex.build(low, high)
+    else:
+        path = os.path.join(cache_dir, f"properties_{low}_{high}.idx")
+        try:
+            index = PropertyIndex.load(path)
+        except (OSError, ValueError):
+            os.makedirs(cache_dir, exist_ok=True)
+            PropertyIndex.build(low, high).save(path)
+            index = PropertyIndex.load(path)
+
+    _indexes[key] = index
+    return index
@@ -0,0 +1,107 @@
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as structure-of-arrays
+
+    Dead slots go back on a free list and are reused by later bursts, so
+    spawning never allocates once the pool exists. Bursts beyond the hard
+    cap are truncated. Positions from before the last update are kept so
+    draw() can interpolate between simulation steps.
+    """
+
+    def __init__(self, capacity=4096, gravity=0.2, seed=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.prev_x = np.zeros(capacity, dtype=np.float32)
+        self.prev_y = np.zeros(capacity, dtype=np.float32)
+        self.speed_x = np.zeros(capacity, dtype=np.float32)
+        self.speed_y = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.max_life = np.ones(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Stack of free slot indices; free_top is the number of free slots
+        self.free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_top = capacity
+
+    def __len__(self):
+        return self.capacity - self.free_top
+
+    def emit(self, x, y, color, count=10, life=30):
+        count = min(count, self.free_top)
+        if count <= 0:
+            return
+        slots = self.free[self.free_top - count:self.free_top]
+        self.free_top -= count
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.prev_x[slots] = x
+        self.prev_y[slots] = y
+        self.speed_x[slots] = self.rng.uniform(-5, 5, count)
+        self.speed_y[slots] = self.rng.uniform(-8, -2, count)
+        self.life[slots] = life
+        self.max_life[slots] = life
+        self.size[slots] = self.rng.integers(2, 6, count)
+        self.color[slots] = color
+        self.alive[slots] = True
+
+    def update(self):
+        if self.free_top == self.capacity:
+            return
+        alive = self.alive
+        self.prev_x[alive] = self.x[alive]
+        self.prev_y[alive] = self.y[alive]
+        self.x[alive] += self.speed_x[alive]
+        self.y[alive] += self.speed_y[alive]
+        self.life[alive] -= 1
+        self.speed_y[alive] += self.gravity
+
+        dead = np.flatnonzero(alive & (self.life <= 0))
+        if len(dead):
+            self.alive[dead] = False
+            self.free[self.free_top:self.free_top + len(dead)] = dead
+            self.free_top += len(dead)
+
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        """Draw at alpha of the way from the previous update to the latest one, positions times scale"""
+        if self.free_top == self.capacity:
+            return
+        slots = np.flatnonzero(self.alive)
+        prev_x = self.prev_x[slots]
+        prev_y = self.prev_y[slots]
+        xs = ((prev_x + (self.x[slots] - prev_x) * alpha) * scale).astype(np.int32).tolist()
+        ys = ((prev_y + (self.y[slots] - prev_y) * alpha) * scale).astype(np.int32).tolist()
+        sizes = np.maximum(1, self.size[slots] * scale).astype(np.int32).tolist()
+        colors = self.color[slots].tolist()
+        for x, y, size, color in zip(xs, ys, sizes, colors):
+            pygame.draw.circle(screen, color, (x, y), size)
+
+    def bounds(self):
+        """Rect covering every live particle at any alpha, or None when the pool is empty"""
+        if self.free_top == self.capacity:
+            return None
+        alive = self.alive
+        reach = int(self.size.max())
+        x = self.x[alive]
+        y = self.y[alive]
+        prev_x = self.prev_x[alive]
+        prev_y = self.prev_y[alive]
+        left = int(min(x.min(), prev_x.min())) - reach
+        top = int(min(y.min(), prev_y.min())) - reach
+        right = int(max(x.max(), prev_x.max())) + reach + 1
+        bottom = int(max(y.max(), prev_y.max())) + reach + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def clear(self):
+        self.alive[:] = False
+        self.free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_top = self.capacity
@@ -0,0 +1,68 @@
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows has no getrusage, so there is no OS wakeup count there
+    resource = None
+
+
+def context_switches():
+    """Voluntary context switches of the calling thread so far, None where the OS doesn't report them
+
+    Each one is the thread giving up the CPU to sleep or block and being
+    woken again, so the count is the real wakeup figure.
+    """
+    if resource is None:
+        return None
+    who = getattr(resource, "RUSAGE_THREAD", resource.RUSAGE_SELF)
+    return resource.getrusage(who).ru_nvcsw
+
+
+class PowerMeter:
+    """CPU time, OS wakeups and time asleep in the main loop since start()
+
+    Wakeups are the main thread's voluntary context switches, as the OS
+    counts them, and are None where it doesn't. Loop iterations are the
+    passes of the main loop: each return from an idle wait and each frame
+    that did not follow one. CPU time is the whole process, audio and
+    loader threads included.
+    """
+
+    def __init__(self, clock=time.perf_counter, cpu_clock=time.process_time, switch_counter=context_switches):
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.switch_counter = switch_counter
+        self.start()
+
+    def start(self):
+        self.started_at = self.clock()
+        self.cpu_at = self.cpu_clock()
+        self.switches_at = self.switch_counter()
+        self.frames = 0
+        self.iterations = 0
+        self.idle_seconds = 0.0
+        self.woken = False
+
+    def frame(self):
+        self.frames += 1
+        if not self.woken:
+            self.iterations += 1
+        self.woken = False
+
+    def slept(self, seconds):
+        self.iterations += 1
+        self.idle_seconds += seconds
+        self.woken = True
+
+    def summary(self):
+        wall = max(self.clock() - self.started_at, 1e-9)
+        switches = self.switch_counter()
+        return {
+            "seconds": wall,
+            "cpu_percent": (self.cpu_clock() - self.cpu_at) / wall * 100,
+            "frames_per_sec": self.frames / wall,
+            "iterations_per_sec": self.iterations / wall,
+            "wakeups_per_sec": None if switches is None else (switches - self.switches_at) / wall,
+            "idle_percent": self.idle_seconds / wall * 100,
+        }
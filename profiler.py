@@ -0,0 +1,88 @@
+import json
+import time
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size ring buffer
+
+    Phases are recorded by wrapping methods with instrument(), so the game
+    code itself stays free of timing calls. Nested phases are allowed; each
+    call becomes one event in the frame it ran in.
+    """
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.frames = [None] * capacity
+        self.next_slot = 0
+        self.count = 0
+        self.events = None
+        self.frame_start = 0.0
+        self.origin = time.perf_counter()
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self.events is not None:
+            self.frames[self.next_slot] = (self.frame_start, now - self.frame_start, self.events)
+            self.next_slot = (self.next_slot + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+        self.frame_start = now
+        self.events = []
+
+    def record(self, name, start, duration):
+        if self.events is not None:
+            self.events.append((name, start, duration))
+
+    def wrap(self, func, name):
+        clock = time.perf_counter
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, clock() - start)
+
+        timed.__wrapped__ = func
+        return timed
+
+    def instrument(self, obj, phases):
+        """Replace obj.<method> with a timed wrapper for every method -> phase pair"""
+        for method_name, phase in phases.items():
+            setattr(obj, method_name, self.wrap(getattr(obj, method_name), phase))
+
+    def recorded_frames(self):
+        start = (self.next_slot - self.count) % self.capacity
+        for i in range(self.count):
+            yield self.frames[(start + i) % self.capacity]
+
+    def averages(self):
+        """Average milliseconds per frame spent in each phase over the buffer"""
+        totals = {}
+        frame_total = 0.0
+        for _, frame_duration, events in self.recorded_frames():
+            frame_total += frame_duration
+            for name, _, duration in events:
+                totals[name] = totals.get(name, 0.0) + duration
+        if not self.count:
+            return {}, 0.0
+        averages = {name: total * 1000 / self.count for name, total in totals.items()}
+        return averages, frame_total * 1000 / self.count
+
+    def export_chrome_trace(self, path):
+        """Write the buffer in Chrome's trace-event format (chrome://tracing, Perfetto)"""
+        trace_events = []
+        for frame_number, (frame_start, frame_duration, events) in enumerate(self.recorded_frames()):
+            trace_events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                "ts": (frame_start - self.origin) * 1e6, "dur": frame_duration * 1e6,
+                "args": {"frame": frame_number},
+            })
+            for name, start, duration in events:
+                trace_events.append({
+                    "name": name, "cat": "phase", "ph": "X", "pid": 1, "tid": 1,
+                    "ts": (start - self.origin) * 1e6, "dur": duration * 1e6,
+                })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        return path
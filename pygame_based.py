@@ -9,17 +9,51 @@
 
 
 
-import pygame
-import random
-import math
 import time
+# Taken before pygame is imported so time-to-first-frame includes the import
+STARTED_AT = time.perf_counter()
+
+import pygame
 import os
-import json 
-pygame.init()
+import sys
+import json
+from asset_loader import AssetLoader
+from input_latency import InputLatencyTracker
+from text_cache import TextCache
+from particles import ParticleSystem
+from power import PowerMeter
+from profiler import FrameProfiler
+from resolution import ResolutionScaler
+from sound import SoundEngine
+from game_logic import NinjaGameLogic
+from score_store import ScoreStore, default_player_name
+from telemetry import TelemetryWriter
 
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 700
 FPS = 60
+# Animations advance in fixed steps whatever the frame rate; after a stall
+# at most MAX_SIM_STEPS are caught up and the rest of the backlog is dropped
+SIM_HZ = 60
+SIM_STEP = 1 / SIM_HZ
+MAX_SIM_STEPS = 8
+# Everything else, MOUSEMOTION above all, is dropped before it reaches the queue
+HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.VIDEORESIZE, pygame.VIDEOEXPOSE]
+# Static screens poll the event queue this many times a second, each poll
+# one sleep and one wakeup, and redraw at least every IDLE_TIMEOUT_MS
+IDLE_FPS = 10
+IDLE_TIMEOUT_MS = 1000
+MAX_PARTICLES = 4096
+BACKGROUND_PATH = "assets/ninja bg.jpg"
+FONT_PATH = "assets/Tanji-Wp9rn.otf"
+FONT_SIZES = (72, 48, 32, 24)
+# The popping number's font size moves in these steps, so the animation reuses a few fonts
+NUMBER_SIZE_STEP = 8
+BUNDLE_PATH = "assets/ninja.bundle"
+# Matches the point where the timer turns red
+TIMER_WARNING = 5
+# Drains over each question's time, between the number and the question text
+QUESTION_BAR = pygame.Rect(SCREEN_WIDTH // 2 - 150, 350, 300, 8)
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -35,57 +69,73 @@ GOLD = (255, 215, 0)
 DARK_RED = (139, 0, 0)
 DARK_GREEN = (0, 100, 0)
 
-class Particle:
-    def __init__(self, x, y, color, speed_x, speed_y, life=30):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.speed_x = speed_x
-        self.speed_y = speed_y
-        self.life = life
-        self.max_life = life
-        self.size = random.randint(2, 5)
-        
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.life -= 1
-        self.speed_y += 0.2 
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            color = (*self.color, alpha)
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-
-class NinjaNumberSlashGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+class NinjaNumberSlashGame(NinjaGameLogic):
+    def __init__(self, score_path="scores.db", render_mode="full", profile=False, telemetry_path="telemetry.bin",
+                 time_source=time.time, rng=None, record_dir=None, fps=FPS, sound=True, idle=True):
+        super().__init__(time_source, rng)
+        # Only the subsystems the game uses; pygame.init() would also start joysticks
+        pygame.display.init()
+        pygame.font.init()
+        # Drawing uses SCREEN_WIDTH x SCREEN_HEIGHT coordinates. In the scaled render mode they
+        # land on an off-screen surface at render_scale, which is stretched over the window
+        self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT),
+                                              pygame.RESIZABLE if render_mode == "scaled" else 0)
+        self.screen = self.window
+        self.viewport = self.window.get_rect()
+        self.view_surface = self.window
+        self.render_scale = 1.0
+        self.fullscreen = False
+        self.scaler = ResolutionScaler(1000 / (fps or FPS)) if render_mode == "scaled" else None
         pygame.display.set_caption("🥷 Ninja Number Slash 🥷")
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
+        self.mouse_pos = (0, 0)
+        self.event_time = 0.0
+        self.input_latency = InputLatencyTracker()
+        self.idle = idle
+        # (event, arrival time) for inputs taken off the queue while idle
+        self.arrived_events = []
+        # SDL neither timestamps events nor queues them while the loop sleeps, so an
+        # input is counted from the poll before the one that found it
+        self.last_poll_at = time.perf_counter()
+        self.power = PowerMeter()
         self.clock = pygame.time.Clock()
-        
-        self.load_assets()
-        
-        self.game_state = "menu" 
-        self.score = 0
-        
-        with open("high_score.json", "r") as f:
-            self.high_score = json.load(f)
-            print(self.high_score,'---------------')
-
-        self.level = 1
-        self.time_limit = 30
-        self.correct_answers = 0
-        self.total_questions = 0
-        self.current_property = ""
-        self.current_number = 0
-        
-        self.level_start_time = 0
-        self.question_start_time = 0
-        self.time_per_question = 5
-        
-        self.particles = []
+        self.fps = fps
+        self.sim_clock = time.perf_counter
+        self.sim_last_time = None
+        self.sim_accumulator = 0.0
+        self.interpolation = 1.0
+        self.render_mode = render_mode
+        self.last_regions = None
+        self.frame_count = 0
+        self.profiler = None
+        self.show_profiler = False
+        self.profiler_lines = []
+        self.text_cache = TextCache()
+        self.first_frame_ms = None
+        self.assets_ready_ms = None
+        
+        self.bg_image = None
+        self.background_cache = {}
+        self.set_fonts({})
+        self.asset_bundle = None
+        self.asset_loader = AssetLoader(BACKGROUND_PATH, FONT_PATH, FONT_SIZES, (SCREEN_WIDTH, SCREEN_HEIGHT),
+                                        BUNDLE_PATH)
+        
+        self.scores = ScoreStore(score_path)
+        self.high_score = self.scores.high_score()
+        self.player_name = default_player_name()
+        self.telemetry = TelemetryWriter(telemetry_path)
+        self.record_dir = record_dir
+        
+        self.particles = ParticleSystem(capacity=MAX_PARTICLES)
+        self.sound = SoundEngine(enabled=sound)
+        for message in self.sound.messages:
+            print(message)
+        self.warned_level = None
         self.slash_animation = 0
         self.number_scale = 1.0
+        self.prev_number_scale = 1.0
         self.background_color = DARK_BLUE
         self.flash_color = None
         self.flash_timer = 0
@@ -98,132 +148,92 @@ class NinjaNumberSlashGame:
         self.instructions_button = pygame.Rect(350, 380, 300, 60)
         self.quit_button = pygame.Rect(350, 460, 300, 60)
         
-    def load_assets(self):
-        """Load background image and fonts with error handling"""
-       
-        try:
-            self.bg_image = pygame.image.load("assets/ninja bg.jpg")
-            self.bg_image = pygame.transform.scale(self.bg_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            print("✓ Background image loaded successfully")
-        except pygame.error:
-            print("⚠ Background image not found, using gradient background")
-            self.bg_image = None
-            
-        try:
-            font_path = "assets/Tanji-Wp9rn.otf"
-            self.ninja_font_big = pygame.font.Font(font_path, 72)
-            self.ninja_font_medium = pygame.font.Font(font_path, 48)
-            self.ninja_font_small = pygame.font.Font(font_path, 32)
-            self.ninja_font_tiny = pygame.font.Font(font_path, 24)
-            print("✓ Custom ninja font loaded successfully")
-        except pygame.error:
-            print("⚠ Custom font not found, using default fonts")
-            self.ninja_font_big = pygame.font.Font(None, 72)
-            self.ninja_font_medium = pygame.font.Font(None, 48)
-            self.ninja_font_small = pygame.font.Font(None, 32)
-            self.ninja_font_tiny = pygame.font.Font(None, 24)
-            
-        self.big_font = self.ninja_font_big
-        self.medium_font = self.ninja_font_medium
-        self.small_font = self.ninja_font_small
-        self.tiny_font = self.ninja_font_tiny
-        
-    def draw_background(self, overlay_alpha=100):
+        if profile:
+            self.enable_profiler()
+        
+    def set_fonts(self, fonts):
+        """Use the loaded ninja fonts by size, or pygame's default font for any that are missing"""
+        big, medium, small, tiny = [fonts.get(size) or self.text_cache.font(None, size) for size in FONT_SIZES]
+        self.ninja_font_big = self.big_font = big
+        self.ninja_font_medium = self.medium_font = medium
+        self.ninja_font_small = self.small_font = small
+        self.ninja_font_tiny = self.tiny_font = tiny
+        
+    def poll_assets(self):
+        """Swap the placeholders for the loaded assets once the loader has finished"""
+        if self.asset_loader is None or not self.asset_loader.ready():
+            return
+        loader = self.asset_loader
+        self.asset_loader = None
+        # Bundled surfaces point into the mapped file, which has to stay open while they live
+        self.asset_bundle = loader.bundle
+        if loader.background is not None:
+            self.bg_image = loader.background if loader.bundle is not None else loader.background.convert()
+        self.set_fonts(loader.fonts)
+        self.background_cache.clear()
+        self.last_regions = None
+        self.assets_ready_ms = (time.perf_counter() - STARTED_AT) * 1000
+        for message in loader.messages:
+            print(message)
+        
+    def wait_for_assets(self):
+        if self.asset_loader is not None:
+            self.asset_loader.wait()
+            self.poll_assets()
+            
+    def build_background(self, overlay_alpha, flash_color):
+        """Pre-blend the background, overlay and flash into one display-format surface"""
+        size = width, height = self.screen.get_size()
+        background = pygame.Surface(size).convert()
+        
         if self.bg_image:
-            self.screen.blit(self.bg_image, (0, 0))
+            image = self.bg_image
+            if image.get_size() != size:
+                image = pygame.transform.smoothscale(image, size)
+            background.blit(image, (0, 0))
             
             if overlay_alpha > 0:
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                overlay = pygame.Surface(size)
                 overlay.set_alpha(overlay_alpha)
                 overlay.fill(BLACK)
-                self.screen.blit(overlay, (0, 0))
+                background.blit(overlay, (0, 0))
         else:
-            for i in range(SCREEN_HEIGHT):
-                color_value = int(50 + (i / SCREEN_HEIGHT) * 100)
+            for i in range(height):
+                color_value = int(50 + (i / height) * 100)
                 color = (0, 0, color_value)
-                pygame.draw.line(self.screen, color, (0, i), (SCREEN_WIDTH, i))
-        
-    def is_prime(self, n):
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
+                pygame.draw.line(background, color, (0, i), (width, i))
+                
+        if flash_color:
+            flash_surface = pygame.Surface(size)
+            flash_surface.set_alpha(100)
+            flash_surface.fill(flash_color)
+            background.blit(flash_surface, (0, 0))
+            
+        return background
         
-    def is_perfect_square(self, n):
-        if n < 0:
-            return False
-        sqrt_n = int(math.sqrt(n))
-        return sqrt_n * sqrt_n == n
-        
-    def is_multiple_of_3(self, n):
-        return n % 3 == 0
-        
-    def is_fibonacci(self, n):
-        fib_numbers = [0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987]
-        return n in fib_numbers
-        
-    def is_even(self, n):
-        return n % 2 == 0
-        
-    def check_property(self, number, property_type):
-        if property_type == "prime":
-            return self.is_prime(number)
-        elif property_type == "perfect_square":
-            return self.is_perfect_square(number)
-        elif property_type == "multiple_of_3":
-            return self.is_multiple_of_3(number)
-        elif property_type == "fibonacci":
-            return self.is_fibonacci(number)
-        elif property_type == "even":
-            return self.is_even(number)
-        return False
-        
-    def get_level_config(self):
-        if self.level == 1:
-            return {
-                "properties": ["prime", "even", "multiple_of_3"],
-                "number_range": (1, 50),
-                "time_per_question": 5
-            }
-        else:
-            return {
-                "properties": ["prime", "perfect_square", "fibonacci", "multiple_of_3"],
-                "number_range": (1, 100),
-                "time_per_question": 4
-            }
-            
-    def get_property_description(self, property_type):
-        descriptions = {
-            "prime": "Prime Number",
-            "even": "Even Number",
-            "multiple_of_3": "Multiple of 3",
-            "perfect_square": "Perfect Square",
-            "fibonacci": "Fibonacci Number"
-        }
-        return descriptions.get(property_type, "Unknown")
+    def draw_background(self, overlay_alpha=100, flash_color=None):
+        key = (overlay_alpha, flash_color)
+        background = self.background_cache.get(key)
+        if background is None:
+            background = self.build_background(overlay_alpha, flash_color)
+            self.background_cache[key] = background
+        self.screen.blit(background, (0, 0))
         
     def create_particles(self, x, y, color, count=10):
-        for _ in range(count):
-            speed_x = random.uniform(-5, 5)
-            speed_y = random.uniform(-8, -2)
-            self.particles.append(Particle(x, y, color, speed_x, speed_y))
+        self.particles.emit(x, y, color, count)
             
     def draw_ninja(self, x, y, size=50):
-        pygame.draw.circle(self.screen, (30, 30, 30), (x, y), size + 3)
-        pygame.draw.circle(self.screen, BLACK, (x, y), size)
-        
-        pygame.draw.circle(self.screen, (200, 200, 255), (x-15, y-10), 10)
-        pygame.draw.circle(self.screen, WHITE, (x-15, y-10), 8)
-        pygame.draw.circle(self.screen, (200, 200, 255), (x+15, y-10), 10)
-        pygame.draw.circle(self.screen, WHITE, (x+15, y-10), 8)
-        pygame.draw.circle(self.screen, BLACK, (x-15, y-10), 4)
-        pygame.draw.circle(self.screen, BLACK, (x+15, y-10), 4)
+        px = self.px
+        point = self.point
+        pygame.draw.circle(self.screen, (30, 30, 30), point(x, y), px(size + 3))
+        pygame.draw.circle(self.screen, BLACK, point(x, y), px(size))
+        
+        pygame.draw.circle(self.screen, (200, 200, 255), point(x-15, y-10), px(10))
+        pygame.draw.circle(self.screen, WHITE, point(x-15, y-10), px(8))
+        pygame.draw.circle(self.screen, (200, 200, 255), point(x+15, y-10), px(10))
+        pygame.draw.circle(self.screen, WHITE, point(x+15, y-10), px(8))
+        pygame.draw.circle(self.screen, BLACK, point(x-15, y-10), px(4))
+        pygame.draw.circle(self.screen, BLACK, point(x+15, y-10), px(4))
         
         if self.slash_animation > 0:
             sword_length = 40 + self.slash_animation * 2
@@ -235,36 +245,54 @@ class NinjaNumberSlashGame:
                 trail_x = x + 20 + (i * 5)
                 trail_y = y - 10 + (i * 2)
                 pygame.draw.line(self.screen, (192, 192, 192, trail_alpha), 
-                               (trail_x, trail_y), (sword_end_x - i*3, sword_end_y + i*2), 2)
+                               point(trail_x, trail_y), point(sword_end_x - i*3, sword_end_y + i*2), max(1, px(2)))
                 
-            pygame.draw.line(self.screen, SILVER, (x+20, y-10), (sword_end_x, sword_end_y), 4)
-            pygame.draw.line(self.screen, WHITE, (x+20, y-10), (sword_end_x, sword_end_y), 2)
-            pygame.draw.circle(self.screen, GOLD, (x+20, y-10), 6)
-            pygame.draw.circle(self.screen, YELLOW, (x+20, y-10), 4)
+            pygame.draw.line(self.screen, SILVER, point(x+20, y-10), point(sword_end_x, sword_end_y), max(1, px(4)))
+            pygame.draw.line(self.screen, WHITE, point(x+20, y-10), point(sword_end_x, sword_end_y), max(1, px(2)))
+            pygame.draw.circle(self.screen, GOLD, point(x+20, y-10), px(6))
+            pygame.draw.circle(self.screen, YELLOW, point(x+20, y-10), px(4))
             
     def draw_button(self, rect, text, color, text_color=WHITE, glow=False):
 
         if glow:
             glow_rect = pygame.Rect(rect.x - 3, rect.y - 3, rect.width + 6, rect.height + 6)
-            pygame.draw.rect(self.screen, (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] + 50)), glow_rect)
+            pygame.draw.rect(self.screen, (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] + 50)),
+                             self.scaled_rect(glow_rect))
             
-        pygame.draw.rect(self.screen, color, rect)
-        pygame.draw.rect(self.screen, WHITE, rect, 3)
-        
-        text_surface = self.medium_font.render(text, True, text_color)
-        text_rect = text_surface.get_rect(center=rect.center)
+        # Border and fill as two solid rects: an outline drawn under a clip that cuts the
+        # button gets traced along the clip edge, which breaks dirty-rect redraws
+        border = max(1, self.px(3))
+        pygame.draw.rect(self.screen, WHITE, self.scaled_rect(rect))
+        pygame.draw.rect(self.screen, color, self.scaled_rect(rect).inflate(-2 * border, -2 * border))
+        
+        text_surface = self.render_text(self.medium_font, text, text_color)
+        text_rect = text_surface.get_rect(center=self.point(*rect.center))
         self.screen.blit(text_surface, text_rect)
         
     def draw_text_with_shadow(self, text, font, color, x, y, shadow_color=(0, 0, 0), shadow_offset=2):
  
-        shadow_surface = font.render(text, True, shadow_color)
-        shadow_rect = shadow_surface.get_rect(center=(x + shadow_offset, y + shadow_offset))
+        shadow_surface = self.render_text(font, text, shadow_color)
+        shadow_rect = shadow_surface.get_rect(center=self.point(x + shadow_offset, y + shadow_offset))
         self.screen.blit(shadow_surface, shadow_rect)
         
-        text_surface = font.render(text, True, color)
-        text_rect = text_surface.get_rect(center=(x, y))
+        text_surface = self.render_text(font, text, color)
+        text_rect = text_surface.get_rect(center=self.point(x, y))
         self.screen.blit(text_surface, text_rect)
         
+    def px(self, value):
+        """A length in screen coordinates on the render surface"""
+        return int(value * self.render_scale)
+        
+    def point(self, x, y):
+        return int(x * self.render_scale), int(y * self.render_scale)
+        
+    def scaled_rect(self, rect):
+        px = self.px
+        return pygame.Rect(px(rect.x), px(rect.y), px(rect.width), px(rect.height))
+        
+    def render_text(self, font, text, color):
+        return self.text_cache.render(font, text, color, self.render_scale)
+        
     def draw_menu(self):
         self.draw_background(overlay_alpha=80)
         
@@ -278,7 +306,7 @@ class NinjaNumberSlashGame:
         
         self.draw_ninja(SCREEN_WIDTH//2, 600, 60)
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.mouse_pos
         
         start_glow = self.start_button.collidepoint(mouse_pos)
         instructions_glow = self.instructions_button.collidepoint(mouse_pos)
@@ -327,27 +355,19 @@ class NinjaNumberSlashGame:
             else:
                 color = WHITE
                 
-            text_surface = self.small_font.render(line, True, color)
-            shadow_surface = self.small_font.render(line, True, BLACK)
-            self.screen.blit(shadow_surface, (52, y_offset + 2))
-            self.screen.blit(text_surface, (50, y_offset))
+            text_surface = self.render_text(self.small_font, line, color)
+            shadow_surface = self.render_text(self.small_font, line, BLACK)
+            self.screen.blit(shadow_surface, self.point(52, y_offset + 2))
+            self.screen.blit(text_surface, self.point(50, y_offset))
             y_offset += 25
             
     def draw_game(self):
         if self.flash_color and self.flash_timer > 0:
-            self.draw_background(overlay_alpha=50)
-            flash_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surface.set_alpha(100)
-            flash_surface.fill(self.flash_color)
-            self.screen.blit(flash_surface, (0, 0))
+            self.draw_background(overlay_alpha=50, flash_color=self.flash_color)
         else:
             self.draw_background(overlay_alpha=100)
         
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.draw(self.screen, self.interpolation, self.render_scale)
                 
         self.draw_text_with_shadow(f"Score: {self.score}", self.medium_font, WHITE, 120, 35)
         self.draw_text_with_shadow(f"Level: {self.level}", self.medium_font, WHITE, 120, 75)
@@ -355,31 +375,35 @@ class NinjaNumberSlashGame:
         accuracy = (self.correct_answers / max(1, self.total_questions)) * 100
         self.draw_text_with_shadow(f"Accuracy: {accuracy:.1f}%", self.small_font, WHITE, 120, 115)
         
-        time_left = self.time_limit - (time.time() - self.level_start_time)
-        time_color = RED if time_left < 5 else WHITE
-        self.draw_text_with_shadow(f"Time: {max(0, time_left):.1f}s", self.medium_font, time_color, 
+        time_color = RED if self.time_left < 5 else WHITE
+        self.draw_text_with_shadow(f"Time: {max(0, self.time_left):.1f}s", self.medium_font, time_color, 
                                   SCREEN_WIDTH-120, 35)
         
         self.draw_text_with_shadow(f"TARGET: {self.get_property_description(self.current_property)}", 
                                   self.medium_font, YELLOW, SCREEN_WIDTH//2, 150, shadow_offset=3)
         
-        number_size = int(120 * self.number_scale)
-        number_font = pygame.font.Font(None, number_size)
+        number_size = self.number_font_size()
+        number_font = self.text_cache.font(None, number_size)
         
+        glow_text = self.render_text(number_font, str(self.current_number), (200, 200, 255))
         for offset in range(5, 0, -1):
-            glow_alpha = 50 - (offset * 10)
-            glow_color = (255, 255, 255, glow_alpha)
-            glow_text = number_font.render(str(self.current_number), True, (200, 200, 255))
-            glow_rect = glow_text.get_rect(center=(SCREEN_WIDTH//2 + offset, 300 + offset))
+            glow_rect = glow_text.get_rect(center=self.point(SCREEN_WIDTH//2 + offset, 300 + offset))
             self.screen.blit(glow_text, glow_rect)
             
         self.draw_text_with_shadow(str(self.current_number), number_font, WHITE, 
                                   SCREEN_WIDTH//2, 300, shadow_offset=4)
         
+        bar_width = self.question_bar_width()
+        if bar_width is not None:
+            pygame.draw.rect(self.screen, DARK_RED, self.scaled_rect(QUESTION_BAR))
+            if bar_width:
+                filled = pygame.Rect(QUESTION_BAR.x, QUESTION_BAR.y, bar_width, QUESTION_BAR.height)
+                pygame.draw.rect(self.screen, YELLOW, self.scaled_rect(filled))
+        
         self.draw_text_with_shadow(f"Is {self.current_number} a {self.current_property.replace('_', ' ')}?", 
                                   self.medium_font, WHITE, SCREEN_WIDTH//2, 400)
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.mouse_pos
         slash_glow = self.slash_button.collidepoint(mouse_pos)
         dodge_glow = self.dodge_button.collidepoint(mouse_pos)
         
@@ -392,6 +416,44 @@ class NinjaNumberSlashGame:
         self.draw_text_with_shadow("SPACE = Slash | D = Dodge", self.small_font, SILVER, 
                                   SCREEN_WIDTH//2, 620)
         
+    def advance_simulation(self):
+        """Run every fixed step that is due, then note how far into the next one this frame falls"""
+        now = self.sim_clock()
+        if self.sim_last_time is None:
+            self.sim_last_time = now
+        self.sim_accumulator += now - self.sim_last_time
+        self.sim_last_time = now
+        
+        steps = 0
+        while self.sim_accumulator >= SIM_STEP:
+            if steps == MAX_SIM_STEPS:
+                self.sim_accumulator %= SIM_STEP
+                break
+            self.sim_accumulator -= SIM_STEP
+            steps += 1
+            if self.game_state == "game":
+                self.advance_animations()
+        self.interpolation = self.sim_accumulator / SIM_STEP
+        
+    def question_bar_width(self):
+        """Filled width of the question timer bar, None when there is no per-question time"""
+        fraction = min(1.0, max(0.0, self.question_time_left / self.time_per_question))
+        return round(QUESTION_BAR.width * fraction)
+        
+    def number_font_size(self):
+        # Expert numbers run to 18 digits, so long ones shrink to fit the screen
+        fit = min(1.0, 9 / max(1, len(str(self.current_number))))
+        steps = max(1, round(120 * self.displayed_number_scale() * fit / NUMBER_SIZE_STEP))
+        return steps * NUMBER_SIZE_STEP
+        
+    def displayed_number_scale(self):
+        return self.prev_number_scale + (self.number_scale - self.prev_number_scale) * self.interpolation
+        
+    def advance_animations(self):
+        """One fixed simulation step of the in-game effects"""
+        self.particles.update()
+        self.prev_number_scale = self.number_scale
+        
         if self.slash_animation > 0:
             self.slash_animation -= 1
             
@@ -405,6 +467,88 @@ class NinjaNumberSlashGame:
             if self.flash_timer <= 0:
                 self.flash_color = None
                 
+    def text_region(self, text, font, x, y, shadow_offset=2):
+        rect = self.text_cache.render(font, text, WHITE).get_rect(center=(x, y))
+        return rect.inflate(shadow_offset * 2, shadow_offset * 2)
+        
+    def frame_regions(self):
+        """Screen regions that can change between frames, keyed on what they show"""
+        mouse_pos = self.mouse_pos
+        regions = {}
+        
+        if self.game_state == "menu":
+            buttons = [self.start_button, self.instructions_button, self.quit_button]
+            scene = (self.game_state, self.high_score)
+        elif self.game_state == "game":
+            buttons = [self.slash_button, self.dodge_button]
+            flash = self.flash_color if self.flash_timer > 0 else None
+            scene = (self.game_state, flash)
+            
+            score_text = f"Score: {self.score}"
+            regions["score"] = (self.text_region(score_text, self.medium_font, 120, 35), score_text)
+            level_text = f"Level: {self.level}"
+            regions["level"] = (self.text_region(level_text, self.medium_font, 120, 75), level_text)
+            accuracy = (self.correct_answers / max(1, self.total_questions)) * 100
+            accuracy_text = f"Accuracy: {accuracy:.1f}%"
+            regions["accuracy"] = (self.text_region(accuracy_text, self.small_font, 120, 115), accuracy_text)
+            time_text = f"Time: {max(0, self.time_left):.1f}s"
+            regions["timer"] = (self.text_region(time_text, self.medium_font, SCREEN_WIDTH-120, 35),
+                                (time_text, self.time_left < 5))
+            
+            target_text = f"TARGET: {self.get_property_description(self.current_property)}"
+            regions["target"] = (self.text_region(target_text, self.medium_font, SCREEN_WIDTH//2, 150, 3),
+                                 target_text)
+            number_size = self.number_font_size()
+            number_font = self.text_cache.font(None, number_size)
+            regions["number"] = (self.text_region(str(self.current_number), number_font, SCREEN_WIDTH//2, 300, 6),
+                                 (self.current_number, number_size))
+            regions["question_timer"] = (QUESTION_BAR, self.question_bar_width())
+            question_text = f"Is {self.current_number} a {self.current_property.replace('_', ' ')}?"
+            regions["question"] = (self.text_region(question_text, self.medium_font, SCREEN_WIDTH//2, 400),
+                                   question_text)
+            regions["ninja"] = (pygame.Rect(40, 490, 240, 120), self.slash_animation)
+            
+            bounds = self.particles.bounds()
+            if bounds is not None:
+                regions["particles"] = (bounds.inflate(40, 40), self.frame_count)
+        else:
+            buttons = []
+            scene = (self.game_state,)
+            
+        for i, button in enumerate(buttons):
+            regions[f"button_{i}"] = (button.inflate(8, 8), button.collidepoint(mouse_pos))
+        regions["scene"] = (self.screen.get_rect(), scene)
+        return regions
+        
+    def present_dirty(self):
+        """Redraw and push only the regions whose contents changed since last frame"""
+        regions = self.frame_regions()
+        previous = self.last_regions
+        self.last_regions = regions
+        
+        if previous is None or previous["scene"] != regions["scene"]:
+            self.draw()
+            self.flip_display()
+            return
+            
+        dirty = []
+        for name, (rect, key) in regions.items():
+            old = previous.get(name)
+            if old is None:
+                dirty.append(rect)
+            elif old[1] != key:
+                dirty.append(rect.union(old[0]))
+        for name, (rect, key) in previous.items():
+            if name not in regions:
+                dirty.append(rect)
+                
+        if dirty:
+            # One clipped pass covers every changed region; only those rects are pushed to the display
+            self.screen.set_clip(dirty[0].unionall(dirty[1:]))
+            self.draw()
+            self.screen.set_clip(None)
+            self.flip_display(dirty)
+            
     def draw_game_over(self):
         self.draw_background(overlay_alpha=120)
         
@@ -447,40 +591,328 @@ class NinjaNumberSlashGame:
         self.draw_text_with_shadow("Press SPACE to return to menu", self.small_font, WHITE, 
                                   SCREEN_WIDTH//2, SCREEN_HEIGHT - 50)
         
-    def generate_question(self):
-        config = self.get_level_config()
-        self.current_number = random.randint(*config["number_range"])
-        self.current_property = random.choice(config["properties"])
-        self.question_start_time = time.time()
+    def start_new_game(self, seed=None):
+        self.warned_level = None
+        super().start_new_game(seed)
+        
+    def generate_question(self, now=None):
+        super().generate_question(now)
         self.number_scale = 1.3  # Start with bigger scale for animation
+        self.prev_number_scale = self.number_scale
         
     def handle_answer(self, user_answer):
-        correct_answer = self.check_property(self.current_number, self.current_property)
-        self.total_questions += 1
-        
-        if user_answer == correct_answer:
-            self.correct_answers += 1
-            points = 10 if self.level == 1 else 15
-            self.score += points
+        correct = super().handle_answer(user_answer)
+        self.telemetry.record(self.current_number, self.current_property, self.last_latency, correct)
+        self.show_answer_effect(correct)
+        return correct
+        
+    def show_answer_effect(self, correct):
+        # Queued straight away, so the cue is heard within a mixer buffer of the flash being drawn
+        self.sound.play("correct" if correct else "wrong")
+        if correct:
             self.create_particles(SCREEN_WIDTH//2, 300, GREEN, 15)
             self.flash_color = (0, 100, 0)
             self.flash_timer = 15
         else:
-            self.score = max(0, self.score - 5)
             self.create_particles(SCREEN_WIDTH//2, 300, RED, 15)
             self.flash_color = (100, 0, 0)
             self.flash_timer = 15
             
         self.slash_animation = 15
         
-    def start_new_game(self):
-        self.score = 0
-        self.correct_answers = 0
-        self.total_questions = 0
-        self.level = 1
-        self.level_start_time = time.time()
-        self.game_state = "game"
-        self.generate_question()
+    def on_game_over(self):
+        if self.score > self.high_score:
+            self.high_score = self.score
+            
+        self.scores.record_game(self.player_name, self.score, self.level,
+                                self.correct_answers, self.total_questions)
+        if self.record_dir:
+            self.save_recording()
+            
+    def save_recording(self):
+        os.makedirs(self.record_dir, exist_ok=True)
+        recording = self.recording()
+        recording["player"] = self.player_name
+        path = os.path.join(self.record_dir, f"game_{int(self.game_start_time)}_{self.game_seed:016x}.json")
+        with open(path, "w") as f:
+            json.dump(recording, f)
+        
+    def handle_event(self, event):
+        """Apply one input event, returns False when the player asked to quit"""
+        if event.type == pygame.QUIT:
+            return False
+            
+        elif event.type == pygame.VIDEOEXPOSE:
+            # The window was uncovered, so the next frame repaints all of it
+            self.window.fill(BLACK)
+            self.last_regions = None
+            
+        elif event.type == pygame.VIDEORESIZE:
+            if self.render_mode == "scaled":
+                self.layout_window()
+                
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F11 and self.render_mode == "scaled":
+                self.toggle_fullscreen()
+            elif event.key == pygame.K_F3:
+                if self.profiler is None:
+                    self.enable_profiler()
+                self.show_profiler = not self.show_profiler
+                self.last_regions = None
+            elif event.key == pygame.K_F4 and self.profiler is not None:
+                path = self.profiler.export_chrome_trace(f"frame_trace_{int(time.time())}.json")
+                print(f"✓ Frame trace written to {path}")
+            elif self.game_state == "menu":
+                if event.key == pygame.K_SPACE:
+                    self.start_new_game()
+                elif event.key == pygame.K_i:
+                    self.game_state = "instructions"
+                elif event.key == pygame.K_q:
+                    return False
+                    
+            elif self.game_state == "instructions":
+                if event.key == pygame.K_ESCAPE:
+                    self.game_state = "menu"
+                    
+            elif self.game_state == "game":
+                if event.key == pygame.K_SPACE:
+                    self.answer_input(True)
+                elif event.key == pygame.K_d:
+                    self.answer_input(False)
+                    
+            elif self.game_state == "game_over":
+                if event.key == pygame.K_SPACE:
+                    self.game_state = "menu"
+                    
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = self.logical_pos(event.pos)
+            
+            if self.game_state == "menu":
+                if self.start_button.collidepoint(mouse_pos):
+                    self.start_new_game()
+                elif self.instructions_button.collidepoint(mouse_pos):
+                    self.game_state = "instructions"
+                elif self.quit_button.collidepoint(mouse_pos):
+                    return False
+                    
+            elif self.game_state == "game":
+                if self.slash_button.collidepoint(mouse_pos):
+                    self.answer_input(True)
+                elif self.dodge_button.collidepoint(mouse_pos):
+                    self.answer_input(False)
+                    
+        return True
+        
+    def answer_input(self, user_answer):
+        self.sound.play("slash" if user_answer else "dodge")
+        self.submit_answer(user_answer)
+        self.input_latency.input_handled(self.event_time)
+        
+    def play_level_cues(self, previous_level):
+        """Level-up chime, and one low-time warning per level"""
+        if self.game_state != "game":
+            return
+        # A new game starts back on level 1, which is no level-up
+        if self.level > previous_level:
+            self.sound.play("level_up")
+        elif self.time_left < TIMER_WARNING and self.warned_level != self.level:
+            self.sound.play("timer_warning")
+            self.warned_level = self.level
+                    
+    def draw(self):
+        if self.game_state == "menu":
+            self.draw_menu()
+        elif self.game_state == "instructions":
+            self.draw_instructions()
+        elif self.game_state == "game":
+            self.draw_game()
+        elif self.game_state == "game_over":
+            self.draw_game_over()
+            
+    def enable_profiler(self, capacity=600):
+        self.profiler = FrameProfiler(capacity)
+        self.profiler.instrument(self, {
+            "pump_events": "events",
+            "update": "logic",
+            "advance_simulation": "animation",
+            "draw": "draw",
+            "draw_background": "background",
+            "draw_text_with_shadow": "text",
+            "draw_button": "buttons",
+            "draw_ninja": "ninja",
+            "flip_display": "flip",
+            "wait_for_frame": "tick",
+        })
+        self.profiler.instrument(self.particles, {"draw": "particles"})
+        
+    def draw_profiler_overlay(self):
+        if self.frame_count % 30 == 0 or not self.profiler_lines:
+            averages, frame_ms = self.profiler.averages()
+            fps = 1000 / frame_ms if frame_ms else 0
+            self.profiler_lines = [f"frame {frame_ms:6.2f} ms  {fps:5.0f} fps"]
+            if self.scaler is not None:
+                self.profiler_lines.append(f"render scale {self.render_scale:.2f}")
+            if self.input_latency.count():
+                displayed = self.input_latency.summary()["displayed"]
+                self.profiler_lines.append(f"input p95 {displayed['p95_ms']:6.2f} ms")
+            self.profiler_lines += [f"{name:<11}{ms:6.2f} ms" for name, ms in averages.items()]
+            
+        panel = pygame.Rect(SCREEN_WIDTH - 250, SCREEN_HEIGHT - 20 - 20 * len(self.profiler_lines), 240, 
+                            10 + 20 * len(self.profiler_lines))
+        pygame.draw.rect(self.screen, BLACK, self.scaled_rect(panel))
+        pygame.draw.rect(self.screen, SILVER, self.scaled_rect(panel), 1)
+        y_offset = panel.y + 5
+        for line in self.profiler_lines:
+            self.screen.blit(self.render_text(self.tiny_font, line, GREEN), self.point(panel.x + 8, y_offset))
+            y_offset += 20
+            
+    def flip_display(self, rects=None):
+        if rects is None:
+            if self.screen is not self.window:
+                # Nearest-neighbour: smoothscale costs more than the smaller render saves
+                pygame.transform.scale(self.screen, self.viewport.size, self.view_surface)
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.input_latency.frame_presented()
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - STARTED_AT) * 1000
+            print(f"✓ First frame after {self.first_frame_ms:.0f} ms")
+            
+    def logical_pos(self, pos):
+        """A window position in the screen coordinates the buttons are laid out in"""
+        viewport = self.viewport
+        if viewport.topleft == (0, 0) and viewport.size == (SCREEN_WIDTH, SCREEN_HEIGHT):
+            return pos
+        return ((pos[0] - viewport.x) * SCREEN_WIDTH // viewport.width,
+                (pos[1] - viewport.y) * SCREEN_HEIGHT // viewport.height)
+        
+    def layout_window(self):
+        """Letterbox the screen into the window at its own aspect ratio"""
+        self.window = pygame.display.get_surface()
+        window_rect = self.window.get_rect()
+        fit = min(window_rect.width / SCREEN_WIDTH, window_rect.height / SCREEN_HEIGHT)
+        self.viewport = pygame.Rect(0, 0, max(1, int(SCREEN_WIDTH * fit)), max(1, int(SCREEN_HEIGHT * fit)))
+        self.viewport.center = window_rect.center
+        self.window.fill(BLACK)
+        self.view_surface = self.window.subsurface(self.viewport)
+        self.set_render_scale(self.render_scale)
+        
+    def set_render_scale(self, scale):
+        """Draw at scale times the screen size from the next frame on"""
+        self.render_scale = scale
+        size = (round(SCREEN_WIDTH * scale), round(SCREEN_HEIGHT * scale))
+        if size == self.window.get_size():
+            self.screen = self.window
+        else:
+            self.screen = pygame.Surface(size).convert()
+        self.background_cache.clear()
+        self.last_regions = None
+        
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+        self.layout_window()
+        
+    def is_idle(self):
+        """Whether the next frame would match the last one unless an input arrives"""
+        return (self.idle and self.game_state != "game" and not self.show_profiler
+                and self.asset_loader is None)
+        
+    def hovered_button(self):
+        buttons = [self.start_button, self.instructions_button, self.quit_button] if self.game_state == "menu" else []
+        for i, button in enumerate(buttons):
+            if button.collidepoint(self.mouse_pos):
+                return i
+        return None
+        
+    def wait_for_input(self):
+        """Sleep at IDLE_FPS between event polls until an input arrives or IDLE_TIMEOUT_MS passes"""
+        hovered = self.hovered_button()
+        # Motion is only let through while asleep, and only wakes a frame when it moves the hover glow
+        pygame.event.set_allowed(pygame.MOUSEMOTION)
+        start = time.perf_counter()
+        deadline = start + IDLE_TIMEOUT_MS / 1000
+        woken = False
+        # pygame.event.wait would poll SDL every millisecond; tick sleeps once per poll
+        while not woken and time.perf_counter() < deadline:
+            self.clock.tick(IDLE_FPS)
+            for event, arrived_at in self.poll_events():
+                if event.type == pygame.MOUSEMOTION:
+                    self.mouse_pos = self.logical_pos(event.pos)
+                    woken = woken or self.hovered_button() != hovered
+                else:
+                    # Handled ahead of anything that queues up behind it
+                    self.arrived_events.append((event, arrived_at))
+                    woken = True
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+        self.power.slept(time.perf_counter() - start)
+        # Nothing animated while asleep, so the fixed-step clock starts afresh instead of catching up
+        self.sim_last_time = None
+        self.sim_accumulator = 0.0
+            
+    def run_frame(self):
+        """One pass of the main loop, returns False on quit"""
+        running = self.step()
+        self.power.frame()
+        self.wait_for_frame()
+        if running and self.is_idle() and not self.arrived_events:
+            self.wait_for_input()
+        return running
+        
+    def wait_for_frame(self):
+        # fps 0 leaves the frame rate uncapped
+        self.clock.tick(self.fps)
+        
+    def poll_events(self):
+        """Take everything off the event queue as (event, arrival time) pairs
+
+        The arrival time is the previous poll, the earliest the event can
+        have come in, so time spent queued is counted in full.
+        """
+        arrived_at = self.last_poll_at
+        self.last_poll_at = time.perf_counter()
+        return [(event, arrived_at) for event in pygame.event.get()]
+        
+    def pump_events(self):
+        running = True
+        # One mouse read per frame serves every hover check
+        self.mouse_pos = self.logical_pos(pygame.mouse.get_pos())
+        events = self.arrived_events + self.poll_events()
+        self.arrived_events = []
+        for event, arrived_at in events:
+            self.event_time = arrived_at
+            if not self.handle_event(event):
+                running = False
+        return running
+        
+    def step(self):
+        """Run one frame without waiting on the clock, returns False on quit"""
+        start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+            
+        # update() is game logic only, it also runs from submit_answer inside event handling
+        level = self.level
+        running = self.pump_events()
+        self.poll_assets()
+        self.frame_count += 1
+        self.advance_simulation()
+        self.update()
+        self.play_level_cues(level)
+        if self.render_mode == "dirty" and not self.show_profiler:
+            self.present_dirty()
+        else:
+            self.draw()
+            if self.show_profiler:
+                self.draw_profiler_overlay()
+            self.flip_display()
+        if self.scaler is not None and self.scaler.record((time.perf_counter() - start) * 1000):
+            self.set_render_scale(self.scaler.scale)
+        return running
         
     def run(self):
         running = True
@@ -489,89 +921,32 @@ class NinjaNumberSlashGame:
         print("   - ninja bg.jpg (background image)")
         print("   - Karasha-z8mYw.otf (ninja font)")
         
+        self.power.start()
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    
-                elif event.type == pygame.KEYDOWN:
-                    if self.game_state == "menu":
-                        if event.key == pygame.K_SPACE:
-                            self.start_new_game()
-                        elif event.key == pygame.K_i:
-                            self.game_state = "instructions"
-                        elif event.key == pygame.K_q:
-                            running = False
-                            
-                    elif self.game_state == "instructions":
-                        if event.key == pygame.K_ESCAPE:
-                            self.game_state = "menu"
-                            
-                    elif self.game_state == "game":
-                        if event.key == pygame.K_SPACE:
-                            self.handle_answer(True)
-                            self.generate_question()
-                        elif event.key == pygame.K_d:
-                            self.handle_answer(False)
-                            self.generate_question()
-                            
-                    elif self.game_state == "game_over":
-                        if event.key == pygame.K_SPACE:
-                            self.game_state = "menu"
-                            
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    
-                    if self.game_state == "menu":
-                        if self.start_button.collidepoint(mouse_pos):
-                            self.start_new_game()
-                        elif self.instructions_button.collidepoint(mouse_pos):
-                            self.game_state = "instructions"
-                        elif self.quit_button.collidepoint(mouse_pos):
-                            running = False
-                            
-                    elif self.game_state == "game":
-                        if self.slash_button.collidepoint(mouse_pos):
-                            self.handle_answer(True)
-                            self.generate_question()
-                        elif self.dodge_button.collidepoint(mouse_pos):
-                            self.handle_answer(False)
-                            self.generate_question()
-                            
-            # Game logic
-            if self.game_state == "game":
-                time_left = self.time_limit - (time.time() - self.level_start_time)
-                if time_left <= 0:
-                    if self.level == 1:
-                        self.level = 2
-                        self.level_start_time = time.time()
-                        self.generate_question()
-                    else:
-                        if self.score > self.high_score:
-                            self.high_score = self.score
-
-                            with open("high_score.json", "w") as f:
-                                json.dump(self.high_score, f)
-                            
-                        self.game_state = "game_over"
-                        
-            if self.game_state == "menu":
-                self.draw_menu()
-            elif self.game_state == "instructions":
-                self.draw_instructions()
-            elif self.game_state == "game":
-                self.draw_game()
-            elif self.game_state == "game_over":
-                self.draw_game_over()
-                
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            running = self.run_frame()
             
+        power = self.power.summary()
+        wakeups = "" if power["wakeups_per_sec"] is None else f"{power['wakeups_per_sec']:.1f} wakeups/s, "
+        print(f"🔋 {power['cpu_percent']:.1f}% CPU, {wakeups}{power['iterations_per_sec']:.1f} loop iterations/s, "
+              f"idle {power['idle_percent']:.0f}% of {power['seconds']:.0f} s")
+        if self.input_latency.count():
+            summary = self.input_latency.summary()
+            displayed = summary["displayed"]
+            print(f"⏱ Input to screen over {summary['inputs']} answers: p50 {displayed['p50_ms']:.1f} ms, "
+                  f"p95 {displayed['p95_ms']:.1f} ms, max {displayed['max_ms']:.1f} ms")
+        self.scores.close()
+        self.telemetry.close()
+        self.sound.close()
         pygame.quit()
 
 if __name__ == "__main__":
     try:
-        game = NinjaNumberSlashGame()
+        render_mode = "dirty" if "--dirty-rects" in sys.argv else "scaled" if "--scaled" in sys.argv else "full"
+        record_dir = "recordings" if "--record" in sys.argv else None
+        fps = int(sys.argv[sys.argv.index("--fps") + 1]) if "--fps" in sys.argv else FPS
+        game = NinjaNumberSlashGame(render_mode=render_mode, profile="--profile" in sys.argv, record_dir=record_dir,
+                                    fps=fps, sound="--mute" not in sys.argv, idle="--no-idle" not in sys.argv)
+        game.expert = "--expert" in sys.argv
         game.run()
     except:
         print("Please Download whole project from the github link given above")
\ No newline at end of file
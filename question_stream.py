@@ -0,0 +1,228 @@
+import math
+import random
+
+import numpy as np
+
+from number_properties import PREDICATES, get_property_index
+
+# Below this share of the range a class is sampled from an explicit pool of
+# numbers instead of by rejection
+POOL_DENSITY = 0.25
+UNPACK_CHUNK = 1 << 20
+
+_samplers = {}
+
+
+def property_flags(index, property_type):
+    """Yield (offset, flags) chunks of the unpacked bitset for one property"""
+    bits = np.frombuffer(index.bitsets[property_type], dtype=np.uint8)
+    size = index.high - index.low + 1
+    for start in range(0, len(bits), UNPACK_CHUNK):
+        flags = np.unpackbits(bits[start:start + UNPACK_CHUNK], bitorder="little")
+        offset = start * 8
+        yield offset, flags[:max(0, size - offset)]
+
+
+class PropertySampler:
+    """Draws numbers from a range that do or don't have one property
+
+    Holds only what the index says about the range; the caller passes the
+    RNG in, so one sampler serves any number of streams and games.
+    """
+
+    def __init__(self, property_type, number_range, cache_dir=None):
+        self.property_type = property_type
+        self.low, self.high = number_range
+        self.index = get_property_index(number_range, cache_dir)
+        self.bitset = self.index.bitsets[property_type]
+        self.bits = np.frombuffer(self.bitset, dtype=np.uint8)
+
+        size = self.high - self.low + 1
+        yes_count = int.from_bytes(self.index.bitsets[property_type], "little").bit_count()
+        self.counts = {True: yes_count, False: size - yes_count}
+        self.pools = {}
+        for answer, count in self.counts.items():
+            if 0 < count < size * POOL_DENSITY:
+                self.pools[answer] = self.build_pool(answer)
+
+    def build_pool(self, answer):
+        chunks = []
+        for offset, flags in property_flags(self.index, self.property_type):
+            chunks.append(np.flatnonzero(flags == answer) + (self.low + offset))
+        return np.concatenate(chunks)
+
+    def has(self, numbers):
+        offsets = numbers - self.low
+        return ((self.bits[offsets >> 3] >> (offsets & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def answers(self, count, yes_ratio, rng):
+        if not self.counts[True]:
+            return np.zeros(count, dtype=bool)
+        if not self.counts[False]:
+            return np.ones(count, dtype=bool)
+        return rng.random(count) < yes_ratio
+
+    def sample(self, answer, count, rng):
+        pool = self.pools.get(answer)
+        if pool is not None:
+            return pool[rng.integers(0, len(pool), count)]
+
+        result = np.empty(count, dtype=np.int64)
+        filled = 0
+        density = self.counts[answer] / (self.high - self.low + 1)
+        while filled < count:
+            wanted = count - filled
+            candidates = rng.integers(self.low, self.high + 1, int(wanted / density) + 16)
+            candidates = candidates[self.has(candidates) == answer][:wanted]
+            result[filled:filled + len(candidates)] = candidates
+            filled += len(candidates)
+        return result
+
+    def numbers(self, answers, rng):
+        numbers = np.empty(len(answers), dtype=np.int64)
+        yes_count = int(answers.sum())
+        numbers[answers] = self.sample(True, yes_count, rng)
+        numbers[~answers] = self.sample(False, len(answers) - yes_count, rng)
+        return numbers
+
+    def draw(self, generator):
+        """One number, as likely "yes" as "no", from a random.Random
+
+        For single questions, where NumPy's per-call cost outweighs the draw.
+        """
+        if not self.counts[True]:
+            answer = False
+        elif not self.counts[False]:
+            answer = True
+        else:
+            answer = generator.random() < 0.5
+        # Indexed ranges are far below 2**53, so scaling random() is uniform enough and much cheaper than randrange
+        pool = self.pools.get(answer)
+        if pool is not None:
+            return int(pool[int(generator.random() * len(pool))])
+        bitset = self.bitset
+        size = self.high - self.low + 1
+        while True:
+            offset = int(generator.random() * size)
+            if (bitset[offset >> 3] >> (offset & 7) & 1) == answer:
+                return self.low + offset
+
+
+class ExactPropertySampler:
+    """PropertySampler for ranges too large to index, built on the exact predicates
+
+    Squares and Fibonacci numbers are too sparse to find by chance, so
+    "yes" numbers for those are constructed directly. Everything else is
+    drawn at random and tested.
+    """
+
+    def __init__(self, property_type, number_range):
+        self.property_type = property_type
+        self.low, self.high = number_range
+        self.predicate = PREDICATES[property_type]
+
+        self.roots = (math.isqrt(self.low - 1) + 1 if self.low > 0 else 0, math.isqrt(self.high))
+        self.fibonacci = []
+        a, b = 0, 1
+        while a <= self.high:
+            if a >= self.low:
+                self.fibonacci.append(a)
+            a, b = b, a + b
+        if property_type == "perfect_square":
+            self.has_yes = self.roots[0] <= self.roots[1]
+        elif property_type == "fibonacci":
+            self.has_yes = bool(self.fibonacci)
+        else:
+            self.has_yes = True
+
+    def answers(self, count, yes_ratio, rng):
+        if not self.has_yes:
+            return np.zeros(count, dtype=bool)
+        return rng.random(count) < yes_ratio
+
+    def sample(self, answer, generator):
+        if answer and self.property_type == "perfect_square":
+            root = generator.randint(*self.roots)
+            return root * root
+        if answer and self.property_type == "fibonacci":
+            return generator.choice(self.fibonacci)
+        while True:
+            n = generator.randint(self.low, self.high)
+            if self.predicate(n) == answer:
+                return n
+
+    def numbers(self, answers, rng):
+        # NumPy's integers stop at 64 bits, Python's don't; seeding from rng keeps streams reproducible
+        generator = random.Random(int(rng.integers(2 ** 63)))
+        numbers = np.empty(len(answers), dtype=object)
+        numbers[:] = [self.sample(answer, generator) for answer in answers.tolist()]
+        return numbers
+
+    def draw(self, generator):
+        """One number, as likely "yes" as "no", from a random.Random"""
+        return self.sample(self.has_yes and generator.random() < 0.5, generator)
+
+
+def make_sampler(property_type, number_range, cache_dir=None):
+    """Return the shared sampler for one property over a range, building it at most once
+
+    Ranges past what the property index covers get an ExactPropertySampler.
+    """
+    key = (property_type, tuple(number_range))
+    sampler = _samplers.get(key)
+    if sampler is None:
+        if get_property_index(number_range, cache_dir) is None:
+            sampler = ExactPropertySampler(property_type, number_range)
+        else:
+            sampler = PropertySampler(property_type, number_range, cache_dir)
+        _samplers[key] = sampler
+    return sampler
+
+
+class QuestionStream:
+    """Seedable stream of (number, property, answer) questions generated in batches
+
+    yes_ratio is the share of questions whose answer is "yes", either one
+    value for every property or a dict per property. It is met exactly in
+    expectation unless a range has no numbers of one class at all.
+    """
+
+    def __init__(self, properties, number_range, yes_ratio=0.5, seed=None, batch_size=1024,
+                 weights=None, cache_dir=None):
+        self.properties = list(properties)
+        self.number_range = tuple(number_range)
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.weights = None if weights is None else np.asarray(weights, dtype=float) / sum(weights)
+        if isinstance(yes_ratio, dict):
+            self.yes_ratios = [yes_ratio.get(p, 0.5) for p in self.properties]
+        else:
+            self.yes_ratios = [yes_ratio] * len(self.properties)
+        # Ranges past what the property index covers fall back to the exact predicates
+        self.exact = get_property_index(self.number_range, cache_dir) is None
+        self.samplers = [make_sampler(p, self.number_range, cache_dir) for p in self.properties]
+        self.buffer = []
+
+    def next_batch(self, count):
+        """Return count questions as (numbers, property_ids, answers) arrays"""
+        property_ids = self.rng.choice(len(self.properties), size=count, p=self.weights)
+        # Python ints once numbers can pass 2**63
+        numbers = np.empty(count, dtype=object if self.exact else np.int64)
+        answers = np.empty(count, dtype=bool)
+        for i, sampler in enumerate(self.samplers):
+            mask = property_ids == i
+            batch_answers = sampler.answers(int(mask.sum()), self.yes_ratios[i], self.rng)
+            numbers[mask] = sampler.numbers(batch_answers, self.rng)
+            answers[mask] = batch_answers
+        return numbers, property_ids, answers
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.buffer:
+            numbers, property_ids, answers = self.next_batch(self.batch_size)
+            properties = [self.properties[i] for i in property_ids.tolist()]
+            self.buffer = list(zip(numbers.tolist(), properties, answers.tolist()))
+            self.buffer.reverse()
+        return self.buffer.pop()
@@ -0,0 +1,77 @@
+import argparse
+import json
+import time
+
+from game_logic import RECORDING_VERSION, NinjaGameLogic
+
+
+class ReplayClock:
+    """Time source that only moves when the replay says so"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def replay(recording, logic=None):
+    """Run a recorded game through the game logic and return the finished logic
+
+    Passing the logic returned by an earlier replay reuses it, which saves
+    setting up a new game per recording.
+    """
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version {recording.get('version')}")
+
+    clock = ReplayClock(recording["start_time"])
+    if logic is None:
+        logic = NinjaGameLogic(time_source=clock)
+    logic.time_source = clock
+    logic.time_limit = recording["time_limit"]
+    logic.expert = recording.get("expert", False)
+    logic.start_new_game(seed=recording["seed"])
+
+    for timestamp, answer in recording["inputs"]:
+        clock.now = timestamp
+        logic.submit_answer(answer)
+
+    # Run the clock past the end of level 2 so the game finishes
+    clock.now = recording["start_time"] + 2 * recording["time_limit"]
+    logic.update()
+    return logic
+
+
+def verify(recording, logic=None):
+    """True when replaying the inputs reproduces the recorded score"""
+    return replay(recording, logic).score == recording["score"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Ninja Number Slash games")
+    parser.add_argument("recordings", nargs="+", help="recording JSON files")
+    args = parser.parse_args()
+
+    recordings = []
+    for path in args.recordings:
+        with open(path) as f:
+            recordings.append((path, json.load(f)))
+
+    start = time.perf_counter()
+    mismatches = 0
+    logic = None
+    for path, recording in recordings:
+        logic = replay(recording, logic)
+        score = logic.score
+        if score != recording["score"]:
+            mismatches += 1
+            print(f"✗ {path}: recorded {recording['score']}, replayed {score}")
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {len(recordings)} games in {elapsed:.3f}s "
+          f"({len(recordings) / max(elapsed, 1e-9):.0f} games/s), {mismatches} mismatched")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+SCALES = (0.5, 0.6, 0.7, 0.85, 1.0)
+SCALE_COOLDOWN = 30
+
+
+class ResolutionScaler:
+    """Picks the internal render scale that keeps frame time under a target
+
+    Frame time is kept as an exponentially weighted average, cleared on
+    every change so each scale is judged on its own frames. Drawing costs
+    roughly the pixel count, so the scale only goes up when the average
+    scaled by the area of the next step still leaves headroom.
+    """
+
+    def __init__(self, target_ms, scales=SCALES, alpha=0.1, headroom=0.8):
+        self.target_ms = target_ms
+        self.scales = scales
+        self.alpha = alpha
+        self.headroom = headroom
+        self.index = len(scales) - 1
+        self.scale = scales[self.index]
+        self.frame_ms = None
+        self.since_change = 0
+        self.changes = 0
+
+    def record(self, frame_ms):
+        """Add one frame's time, returns whether the scale changed"""
+        alpha = self.alpha
+        self.frame_ms = frame_ms if self.frame_ms is None else self.frame_ms + alpha * (frame_ms - self.frame_ms)
+        self.since_change += 1
+        if self.since_change < SCALE_COOLDOWN:
+            return False
+
+        if self.frame_ms > self.target_ms and self.index > 0:
+            return self.set_index(self.index - 1)
+        if self.index < len(self.scales) - 1:
+            growth = (self.scales[self.index + 1] / self.scale) ** 2
+            if self.frame_ms * growth < self.headroom * self.target_ms:
+                return self.set_index(self.index + 1)
+        return False
+
+    def set_index(self, index):
+        self.index = index
+        self.scale = self.scales[index]
+        self.frame_ms = None
+        self.since_change = 0
+        self.changes += 1
+        return True
@@ -0,0 +1,188 @@
+import argparse
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PLAYER = "ninja"
+WRITE_RETRY_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_player ON games (player, score DESC);
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    best_score INTEGER NOT NULL,
+    games INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_by_best ON players (best_score DESC);
+"""
+
+
+def default_player_name():
+    return os.environ.get("USER") or os.environ.get("USERNAME") or DEFAULT_PLAYER
+
+
+def read_legacy_high_score(path):
+    """The old high_score.json holds a bare number; anything else counts as 0"""
+    try:
+        with open(path) as f:
+            return max(0, int(json.load(f)))
+    except (OSError, ValueError, TypeError):
+        return 0
+
+
+def connect(path):
+    # SQLite's own file locks serialize writers from several game processes,
+    # and WAL journaling keeps every committed game intact after a crash
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=FULL")
+    return connection
+
+
+class ScoreStore:
+    """Shared high scores and leaderboards backed by SQLite
+
+    record_game only queues the result; a background thread owns the write
+    connection, so callers in a frame loop never wait on the disk. A failed
+    write keeps its games and retries them, until close() gives up on them.
+    """
+
+    def __init__(self, path="scores.db", legacy_path="high_score.json"):
+        self.path = path
+        self.connection = connect(path)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            empty = self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 0
+            legacy_score = read_legacy_high_score(legacy_path) if legacy_path and empty else 0
+            if legacy_score:
+                self.write_game(self.connection, (DEFAULT_PLAYER, legacy_score, 2, 0, 0, time.time()))
+
+        self.best = self.connection.execute("SELECT MAX(best_score) FROM players").fetchone()[0] or 0
+        self.pending = queue.Queue()
+        self.write_errors = 0
+        self.writer = threading.Thread(target=self.write_loop, name="score-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    @staticmethod
+    def write_game(connection, game):
+        player, score = game[0], game[1]
+        connection.execute(
+            "INSERT INTO games (player, score, level, correct, total, played_at) VALUES (?, ?, ?, ?, ?, ?)", game)
+        connection.execute(
+            "INSERT INTO players (name, best_score, games) VALUES (?, ?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET best_score = MAX(best_score, excluded.best_score), games = games + 1",
+            (player, score))
+
+    def write_loop(self):
+        connection = None
+        unwritten = []
+        stop = False
+        while not stop:
+            try:
+                # A batch waiting on a retry wakes the writer even when nothing new is queued
+                batch = [self.pending.get(timeout=WRITE_RETRY_SECONDS if unwritten else None)]
+            except queue.Empty:
+                batch = []
+            # Drain whatever else is queued into the same transaction
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            unwritten += [g for g in batch if g is not None]
+            try:
+                if unwritten:
+                    if connection is None:
+                        connection = connect(self.path)
+                    with connection:
+                        for g in unwritten:
+                            self.write_game(connection, g)
+                    unwritten = []
+            except sqlite3.Error as e:
+                self.write_errors += 1
+                if stop:
+                    print(f"⚠ Could not save {len(unwritten)} game(s) to {self.path} ({e}), dropping them")
+                else:
+                    print(f"⚠ Could not save {len(unwritten)} game(s) to {self.path} ({e}), retrying")
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+        if connection is not None:
+            connection.close()
+
+    def record_game(self, player, score, level, correct, total):
+        self.best = max(self.best, score)
+        self.pending.put((player, score, level, correct, total, time.time()))
+
+    def high_score(self):
+        return self.best
+
+    def flush(self):
+        """Block until every queued game has been committed, or kept back for a retry after a failed write"""
+        self.pending.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.connection.close()
+
+    def top_players(self, limit=100):
+        return self.connection.execute(
+            "SELECT name, best_score, games FROM players ORDER BY best_score DESC, name LIMIT ?",
+            (limit,)).fetchall()
+
+    def player_top(self, player, limit=10):
+        return self.connection.execute(
+            "SELECT score, level, correct, total, played_at FROM games WHERE player = ? "
+            "ORDER BY score DESC LIMIT ?", (player, limit)).fetchall()
+
+    def rank(self, player):
+        """1-based leaderboard position by best score, or None for unknown players"""
+        row = self.connection.execute("SELECT best_score FROM players WHERE name = ?", (player,)).fetchone()
+        if row is None:
+            return None
+        ahead = self.connection.execute(
+            "SELECT COUNT(*) FROM players WHERE best_score > ?", (row[0],)).fetchone()[0]
+        return ahead + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the Ninja Number Slash leaderboard")
+    parser.add_argument("--db", default="scores.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    top = commands.add_parser("top", help="best score per player")
+    top.add_argument("limit", type=int, nargs="?", default=100)
+    player = commands.add_parser("player", help="a player's best games and rank")
+    player.add_argument("name")
+    player.add_argument("limit", type=int, nargs="?", default=10)
+    args = parser.parse_args()
+
+    store = ScoreStore(args.db, legacy_path=None)
+    if args.command == "top":
+        for position, (name, best_score, games) in enumerate(store.top_players(args.limit), 1):
+            print(f"{position:>4}. {name:<20} {best_score:>6}  ({games} games)")
+    else:
+        print(f"{args.name}: rank {store.rank(args.name)}")
+        for score, level, correct, total, played_at in store.player_top(args.name, args.limit):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(played_at))
+            print(f"  {score:>6}  level {level}  {correct}/{total}  {when}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pygame
+
+SAMPLE_RATE = 44100
+# 256 frames is under 6 ms of audio at 44.1 kHz, well inside one 60 fps frame
+MIXER_BUFFER = 256
+CHANNELS = 8
+SOUND_DIR = "assets/sounds"
+# Tones used for any cue without a WAV in SOUND_DIR: (start Hz, end Hz, seconds), 0 Hz is a rest
+CUES = {
+    "slash": [(1400, 300, 0.08)],
+    "dodge": [(300, 700, 0.10)],
+    "correct": [(660, 660, 0.07), (880, 880, 0.12)],
+    "wrong": [(220, 130, 0.25)],
+    "level_up": [(523, 523, 0.09), (659, 659, 0.09), (784, 784, 0.09), (1047, 1047, 0.2)],
+    "timer_warning": [(1000, 1000, 0.05), (0, 0, 0.05), (1000, 1000, 0.05)],
+}
+VOLUME = 0.3
+
+
+def synthesize(segments, frequency, channels):
+    """16-bit PCM for a run of swept sine tones, each with a short decay"""
+    parts = []
+    for start, end, seconds in segments:
+        count = int(seconds * frequency)
+        if not start:
+            parts.append(np.zeros(count))
+            continue
+        t = np.arange(count) / frequency
+        # Linear sweep: the phase is the integral of the instantaneous frequency
+        phase = 2 * np.pi * (start * t + (end - start) * t * t / (2 * seconds))
+        envelope = np.minimum(1.0, t / 0.005) * np.exp(-3 * t / seconds)
+        parts.append(np.sin(phase) * envelope)
+    mono = (np.concatenate(parts) * VOLUME * 32767).astype(np.int16)
+    return np.repeat(mono[:, None], channels, axis=1)
+
+
+class SoundEngine:
+    """Game sound cues, decoded once and played on a fixed pool of reserved channels
+
+    Each cue is loaded from SOUND_DIR if there is a WAV for it and otherwise
+    synthesized, and kept as an in-memory Sound. Playing one only picks the
+    next channel of the pool, so it never decodes or allocates mid-game.
+    Muted, or without an audio device, every play() is a no-op.
+    """
+
+    def __init__(self, sound_dir=SOUND_DIR, channels=CHANNELS, buffer=MIXER_BUFFER, enabled=True):
+        self.buffer = buffer
+        self.sounds = {}
+        self.channels = []
+        self.next_channel = 0
+        self.messages = []
+        if not enabled:
+            return
+        try:
+            # allowedchanges=0 makes SDL convert to this format rather than grow the buffer
+            pygame.mixer.init(SAMPLE_RATE, -16, 2, buffer, allowedchanges=0)
+        except pygame.error as e:
+            self.messages.append(f"⚠ No audio device ({e}), playing without sound")
+            return
+
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.frequency, _, output_channels = pygame.mixer.get_init()
+
+        loaded = 0
+        for name, segments in CUES.items():
+            path = os.path.join(sound_dir, f"{name}.wav")
+            if os.path.exists(path):
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(path)
+                    loaded += 1
+                    continue
+                except pygame.error:
+                    pass
+            samples = synthesize(segments, self.frequency, output_channels)
+            self.sounds[name] = pygame.mixer.Sound(buffer=samples.tobytes())
+        if loaded:
+            self.messages.append(f"✓ {loaded} sound(s) loaded from {sound_dir}")
+        self.messages.append(f"✓ Sound ready, {self.latency_ms():.1f} ms mixer buffer")
+
+    def enabled(self):
+        return bool(self.channels)
+
+    def latency_ms(self):
+        """Worst-case delay the mixer buffer adds before a cue is heard"""
+        if not self.channels:
+            return 0.0
+        return self.buffer / self.frequency * 1000
+
+    def play(self, name):
+        if not self.channels:
+            return
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(self.channels)
+        # The pool is round robin, so only the oldest cue is ever cut short
+        channel.play(self.sounds[name])
+
+    def close(self):
+        if self.channels:
+            pygame.mixer.quit()
+            self.channels = []
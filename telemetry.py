@@ -0,0 +1,176 @@
+import argparse
+import atexit
+import struct
+import sys
+import time
+from array import array
+
+import numpy as np
+
+from number_properties import PROPERTY_NAMES
+
+BLOCK_MAGIC = b"NNST"
+BLOCK_VERSION = 1
+BLOCK_HEADER = struct.Struct("<4sHHI")
+
+# Column name, array typecode and matching little-endian NumPy dtype
+COLUMNS = [
+    ("timestamp", "d", "<f8"),
+    ("number", "Q", "<u8"),
+    ("property", "B", "u1"),
+    ("latency_ms", "f", "<f4"),
+    ("correct", "B", "u1"),
+]
+RECORD_SIZE = sum(np.dtype(dtype).itemsize for _, _, dtype in COLUMNS)
+
+MAX_LATENCY_MS = 60000
+
+
+class TelemetryWriter:
+    """Append-only log of answers, buffered in fixed-width columns
+
+    Records are written in blocks of block_size: a header with the record
+    count, then each column as packed little-endian values.
+    """
+
+    def __init__(self, path="telemetry.bin", block_size=256):
+        self.path = path
+        self.block_size = block_size
+        self.columns = [array(typecode) for _, typecode, _ in COLUMNS]
+        self.file = open(path, "ab")
+        atexit.register(self.close)
+
+    def record(self, number, property_type, latency, correct, timestamp=None):
+        times, numbers, properties, latencies, corrects = self.columns
+        times.append(time.time() if timestamp is None else timestamp)
+        numbers.append(number)
+        properties.append(PROPERTY_NAMES.index(property_type))
+        latencies.append(latency * 1000)
+        corrects.append(1 if correct else 0)
+        if len(numbers) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        count = len(self.columns[0])
+        if not count:
+            return
+        parts = [BLOCK_HEADER.pack(BLOCK_MAGIC, BLOCK_VERSION, 0, count)]
+        for column in self.columns:
+            if sys.byteorder == "big":
+                column.byteswap()
+            parts.append(column.tobytes())
+            del column[:]
+        self.file.write(b"".join(parts))
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def read_blocks(path):
+    """Yield each block as a dict of NumPy columns, one block in memory at a time
+
+    A block cut short by a crash ends the stream instead of raising.
+    """
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            magic, version, _, count = BLOCK_HEADER.unpack(header)
+            if magic != BLOCK_MAGIC or version != BLOCK_VERSION:
+                raise ValueError(f"{path} is not a telemetry log")
+            payload = f.read(count * RECORD_SIZE)
+            if len(payload) < count * RECORD_SIZE:
+                return
+            block = {}
+            offset = 0
+            for name, _, dtype in COLUMNS:
+                block[name] = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+                offset += count * block[name].itemsize
+            yield block
+
+
+class TelemetryStats:
+    """Streaming accuracy and latency percentiles per property
+
+    Latencies go into 1 ms histogram buckets, so memory stays fixed no
+    matter how large the log is. Small blocks are pooled into batches of
+    batch_records before they are counted.
+    """
+
+    def __init__(self, batch_records=1 << 20):
+        self.batch_records = batch_records
+        self.pending = []
+        self.pending_records = 0
+        self.answers = np.zeros(len(PROPERTY_NAMES), dtype=np.int64)
+        self.correct = np.zeros(len(PROPERTY_NAMES), dtype=np.int64)
+        self.histograms = np.zeros((len(PROPERTY_NAMES), MAX_LATENCY_MS + 1), dtype=np.int64)
+
+    def add_block(self, block):
+        self.pending.append(block)
+        self.pending_records += len(block["property"])
+        if self.pending_records >= self.batch_records:
+            self.count_pending()
+
+    def count_pending(self):
+        if not self.pending:
+            return
+        properties = np.concatenate([b["property"] for b in self.pending]).astype(np.intp)
+        correct = np.concatenate([b["correct"] for b in self.pending])
+        latencies = np.concatenate([b["latency_ms"] for b in self.pending])
+        self.pending = []
+        self.pending_records = 0
+
+        self.answers += np.bincount(properties, minlength=len(PROPERTY_NAMES))
+        self.correct += np.bincount(properties, weights=correct,
+                                    minlength=len(PROPERTY_NAMES)).astype(np.int64)
+        buckets = np.clip(latencies, 0, MAX_LATENCY_MS).astype(np.intp)
+        cells = properties * (MAX_LATENCY_MS + 1) + buckets
+        self.histograms += np.bincount(cells, minlength=self.histograms.size).reshape(self.histograms.shape)
+
+    @staticmethod
+    def percentile(histogram, fraction):
+        total = histogram.sum()
+        if not total:
+            return 0.0
+        return float(np.searchsorted(np.cumsum(histogram), fraction * total))
+
+    def summary(self):
+        self.count_pending()
+        rows = {}
+        for i, name in enumerate(PROPERTY_NAMES):
+            if self.answers[i]:
+                rows[name] = self.summarize(self.answers[i], self.correct[i], self.histograms[i])
+        rows["all"] = self.summarize(self.answers.sum(), self.correct.sum(), self.histograms.sum(axis=0))
+        return rows
+
+    def summarize(self, answers, correct, histogram):
+        return {
+            "answers": int(answers),
+            "accuracy": float(correct / answers) if answers else 0.0,
+            "p50_ms": self.percentile(histogram, 0.50),
+            "p90_ms": self.percentile(histogram, 0.90),
+            "p99_ms": self.percentile(histogram, 0.99),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a Ninja Number Slash telemetry log")
+    parser.add_argument("path", nargs="?", default="telemetry.bin")
+    args = parser.parse_args()
+
+    stats = TelemetryStats()
+    for block in read_blocks(args.path):
+        stats.add_block(block)
+
+    print(f"{'property':<16}{'answers':>10}{'accuracy':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    for name, row in stats.summary().items():
+        print(f"{name:<16}{row['answers']:>10}{row['accuracy'] * 100:>9.1f}%"
+              f"{row['p50_ms']:>9.0f}{row['p90_ms']:>9.0f}{row['p99_ms']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,33 @@
-import random
+import sys
 import time
-import math
-import os
+from difficulty import DifficultyEngine
+from game_logic import level_config
+from number_properties import (PREDICATES, get_property_index, is_even, is_fibonacci, is_multiple_of_3,
+                               is_perfect_square, is_prime)
+from terminal_renderer import TerminalRenderer
+from score_store import ScoreStore, default_player_name
+from telemetry import TelemetryWriter
 
 class NinjaNumberSlash:
-    def __init__(self):
+    def __init__(self, scores=None, telemetry=None):
+        self.scores = scores if scores is not None else ScoreStore()
+        self.telemetry = telemetry if telemetry is not None else TelemetryWriter()
+        self.player_name = default_player_name()
         self.score = 0
-        self.high_score = 0
+        self.high_score = self.scores.high_score()
         self.level = 1
+        self.expert = False
         self.time_limit = 30  # seconds per level
         self.correct_answers = 0
         self.total_questions = 0
         self.current_property = ""
+        self.current_range = (1, 50)
+        self.property_cache_dir = None
+        self.difficulty = DifficultyEngine()
+        self.renderer = TerminalRenderer()
         
     def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.renderer.clear()
         
     def display_ninja_art(self):
         ninja_art = """
@@ -30,60 +43,29 @@ class NinjaNumberSlash:
         print(ninja_art)
         
     def is_prime(self, n):
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
+        return is_prime(n)
         
     def is_perfect_square(self, n):
-        if n < 0:
-            return False
-        sqrt_n = int(math.sqrt(n))
-        return sqrt_n * sqrt_n == n
+        return is_perfect_square(n)
         
     def is_multiple_of_3(self, n):
-        return n % 3 == 0
+        return is_multiple_of_3(n)
         
     def is_fibonacci(self, n):
-        # Check if n is a Fibonacci number
-        fib_numbers = [0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987]
-        return n in fib_numbers
+        return is_fibonacci(n)
         
     def is_even(self, n):
-        return n % 2 == 0
+        return is_even(n)
         
     def check_property(self, number, property_type):
-        if property_type == "prime":
-            return self.is_prime(number)
-        elif property_type == "perfect_square":
-            return self.is_perfect_square(number)
-        elif property_type == "multiple_of_3":
-            return self.is_multiple_of_3(number)
-        elif property_type == "fibonacci":
-            return self.is_fibonacci(number)
-        elif property_type == "even":
-            return self.is_even(number)
-        return False
+        index = get_property_index(self.current_range, self.property_cache_dir)
+        if index is not None and index.covers(number) and property_type in index:
+            return index.lookup(number, property_type)
+        predicate = PREDICATES.get(property_type)
+        return predicate(number) if predicate is not None else False
         
     def get_level_config(self):
-        if self.level == 1:
-            return {
-                "properties": ["prime", "even", "multiple_of_3"],
-                "number_range": (1, 50),
-                "time_per_question": 5
-            }
-        else:  # Level 2
-            return {
-                "properties": ["prime", "perfect_square", "fibonacci", "multiple_of_3"],
-                "number_range": (1, 100),
-                "time_per_question": 4
-            }
+        return level_config(self.level, self.expert)
             
     def get_property_description(self, property_type):
         descriptions = {
@@ -95,23 +77,90 @@ class NinjaNumberSlash:
         }
         return descriptions.get(property_type, "Unknown property")
         
+    def game_state_lines(self, number, time_left):
+        property_name = self.current_property.replace('_', ' ')
+        return [
+            "⚔️" * 50,
+            f"🥷 NINJA NUMBER SLASH - LEVEL {self.level} 🥷",
+            "⚔️" * 50,
+            f"Score: {self.score} | High Score: {self.high_score}",
+            f"Accuracy: {self.correct_answers}/{self.total_questions}",
+            f"Time Left: {time_left:.1f}s",
+            "-" * 50,
+            f"TARGET: {self.get_property_description(self.current_property)}",
+            "-" * 50,
+            "",
+            f"🎯 NUMBER TO SLASH: {number}",
+            "",
+            f"Is {number} a {property_name}?",
+            "",
+            "[Y] - SLASH (Yes) | [N] - DODGE (No) | [Q] - Quit",
+        ]
+        
     def display_game_state(self, number, time_left):
-        self.clear_screen()
-        print("⚔️" * 50)
-        print(f"🥷 NINJA NUMBER SLASH - LEVEL {self.level} 🥷")
-        print("⚔️" * 50)
-        print(f"Score: {self.score} | High Score: {self.high_score}")
-        print(f"Accuracy: {self.correct_answers}/{self.total_questions}")
-        print(f"Time Left: {time_left:.1f}s")
-        print("-" * 50)
-        print(f"TARGET: {self.get_property_description(self.current_property)}")
-        print("-" * 50)
-        print(f"\n🎯 NUMBER TO SLASH: {number}")
-        print(f"\nIs {number} a {self.current_property.replace('_', ' ')}?")
-        print("\n[Y] - SLASH (Yes) | [N] - DODGE (No) | [Q] - Quit")
+        self.renderer.render(self.game_state_lines(number, time_left) + ["", "Quick! Make your choice:"])
+        
+    def parse_answer(self, user_input):
+        """Map typed input to True/False, 'quit', or None when it isn't valid"""
+        user_input = user_input.lower().strip()
+        if user_input == 'q':
+            return "quit"
+        if user_input in ['y', 'yes', 'slash']:
+            return True
+        if user_input in ['n', 'no', 'dodge']:
+            return False
+        return None
+        
+    def score_answer(self, number, user_answer, latency):
+        """Update score and counters, returns (is_correct, correct_answer, points)"""
+        correct_answer = self.check_property(number, self.current_property)
+        self.total_questions += 1
+        self.telemetry.record(number, self.current_property, latency, user_answer == correct_answer)
+        self.difficulty.record(number, self.current_property, user_answer == correct_answer, latency)
+        
+        if user_answer == correct_answer:
+            self.correct_answers += 1
+            points = 10 if self.level == 1 else 15
+            self.score += points
+            return True, correct_answer, points
+        self.score = max(0, self.score - 5)
+        return False, correct_answer, 5
+        
+    def answer_feedback_lines(self, number, is_correct, correct_answer, points):
+        property_name = self.current_property.replace('_', ' ')
+        if is_correct:
+            lines = [f"⚔️ CORRECT SLASH! +{points} points!"]
+            mark = "✅"
+        else:
+            lines = [f"❌ WRONG MOVE! -{points} points!"]
+            mark = "💡"
+        if correct_answer:
+            lines.append(f"{mark} {number} IS a {property_name}!")
+        else:
+            lines.append(f"{mark} {number} is NOT a {property_name}!")
+        return lines
+        
+    def level_complete_lines(self, level_score, questions_this_level):
+        lines = [
+            "⚔️" * 50,
+            f"🎉 LEVEL {self.level} COMPLETE! 🎉",
+            "⚔️" * 50,
+            f"Level Score: {level_score}",
+            f"Questions Answered: {questions_this_level}",
+            f"Total Score: {self.score}",
+        ]
+        if self.level == 1:
+            lines.append(f"Accuracy: {(self.correct_answers/max(1, self.total_questions))*100:.1f}%")
+            lines += ["", "Preparing for Level 2..."]
+        return lines
+        
+    def next_question(self):
+        """Pick the next number and property, returns (number, time_per_question)"""
+        number, self.current_property, config = self.difficulty.next_question(self.get_level_config())
+        self.current_range = config["number_range"]
+        return number, config["time_per_question"]
         
     def play_level(self):
-        config = self.get_level_config()
         level_start_time = time.time()
         questions_this_level = 0
         level_score = 0
@@ -122,58 +171,37 @@ class NinjaNumberSlash:
         time.sleep(2)
         
         while time.time() - level_start_time < self.time_limit:
-            # Generate random number and property
-            number = random.randint(*config["number_range"])
-            self.current_property = random.choice(config["properties"])
+            number, time_per_question = self.next_question()
             
             question_start_time = time.time()
             
-            while time.time() - question_start_time < config["time_per_question"]:
+            while time.time() - question_start_time < time_per_question:
                 time_left = self.time_limit - (time.time() - level_start_time)
                 if time_left <= 0:
                     break
                     
                 self.display_game_state(number, time_left)
+                shown_at = time.time()
                 
                 # Get user input with timeout simulation
-                print("\nQuick! Make your choice:")
                 try:
-                    user_input = input().lower().strip()
+                    user_answer = self.parse_answer(input())
                     
-                    if user_input == 'q':
+                    if user_answer == "quit":
                         return False
                         
-                    if user_input in ['y', 'yes', 'slash']:
-                        user_answer = True
-                    elif user_input in ['n', 'no', 'dodge']:
-                        user_answer = False
-                    else:
+                    if user_answer is None:
                         print("❌ Invalid input! Use Y/N")
                         time.sleep(1)
                         continue
                         
                     # Check answer
-                    correct_answer = self.check_property(number, self.current_property)
-                    self.total_questions += 1
+                    is_correct, correct_answer, points = self.score_answer(number, user_answer,
+                                                                           time.time() - shown_at)
                     questions_this_level += 1
-                    
-                    if user_answer == correct_answer:
-                        self.correct_answers += 1
-                        points = 10 if self.level == 1 else 15
-                        self.score += points
+                    if is_correct:
                         level_score += points
-                        print(f"⚔️ CORRECT SLASH! +{points} points!")
-                        if correct_answer:
-                            print(f"✅ {number} IS a {self.current_property.replace('_', ' ')}!")
-                        else:
-                            print(f"✅ {number} is NOT a {self.current_property.replace('_', ' ')}!")
-                    else:
-                        self.score = max(0, self.score - 5)
-                        print(f"❌ WRONG MOVE! -5 points!")
-                        if correct_answer:
-                            print(f"💡 {number} IS a {self.current_property.replace('_', ' ')}!")
-                        else:
-                            print(f"💡 {number} is NOT a {self.current_property.replace('_', ' ')}!")
+                    print("\n".join(self.answer_feedback_lines(number, is_correct, correct_answer, points)))
                     
                     time.sleep(1.5)
                     break
@@ -183,66 +211,74 @@ class NinjaNumberSlash:
                     
         # Level complete
         self.clear_screen()
-        print("⚔️" * 50)
-        print(f"🎉 LEVEL {self.level} COMPLETE! 🎉")
-        print("⚔️" * 50)
-        print(f"Level Score: {level_score}")
-        print(f"Questions Answered: {questions_this_level}")
-        print(f"Total Score: {self.score}")
+        print("\n".join(self.level_complete_lines(level_score, questions_this_level)))
         
         if self.level == 1:
-            print(f"Accuracy: {(self.correct_answers/self.total_questions)*100:.1f}%")
-            print("\nPreparing for Level 2...")
             time.sleep(3)
-            return True
-        else:
-            return True
+        return True
             
-    def show_final_stats(self):
-        self.clear_screen()
-        print("⚔️" * 50)
-        print("🏆 FINAL NINJA STATS 🏆")
-        print("⚔️" * 50)
-        print(f"Final Score: {self.score}")
-        print(f"Questions Answered: {self.total_questions}")
-        print(f"Correct Answers: {self.correct_answers}")
-        print(f"Accuracy: {(self.correct_answers/self.total_questions)*100:.1f}%")
+    def get_rank(self):
+        if self.score >= 300:
+            return "🥇 MASTER NINJA"
+        elif self.score >= 200:
+            return "🥈 SKILLED NINJA"
+        elif self.score >= 100:
+            return "🥉 APPRENTICE NINJA"
+        return "🥷 NINJA IN TRAINING"
         
+    def final_stats_lines(self):
+        lines = [
+            "⚔️" * 50,
+            "🏆 FINAL NINJA STATS 🏆",
+            "⚔️" * 50,
+            f"Final Score: {self.score}",
+            f"Questions Answered: {self.total_questions}",
+            f"Correct Answers: {self.correct_answers}",
+            f"Accuracy: {(self.correct_answers/max(1, self.total_questions))*100:.1f}%",
+        ]
         if self.score > self.high_score:
             self.high_score = self.score
-            print("🎉 NEW HIGH SCORE! 🎉")
+            lines.append("🎉 NEW HIGH SCORE! 🎉")
+        lines.append(f"Ninja Rank: {self.get_rank()}")
+        return lines
         
-        # Ninja ranking
-        if self.score >= 300:
-            rank = "🥇 MASTER NINJA"
-        elif self.score >= 200:
-            rank = "🥈 SKILLED NINJA"
-        elif self.score >= 100:
-            rank = "🥉 APPRENTICE NINJA"
-        else:
-            rank = "🥷 NINJA IN TRAINING"
-            
-        print(f"Ninja Rank: {rank}")
+    def record_score(self):
+        self.scores.record_game(self.player_name, self.score, self.level,
+                                self.correct_answers, self.total_questions)
+        
+    def show_final_stats(self):
+        self.clear_screen()
+        print("\n".join(self.final_stats_lines()))
+        self.record_score()
+        
+    def instruction_lines(self):
+        return [
+            "📜 NINJA TRAINING SCROLL 📜",
+            "=" * 50,
+            "🎯 MISSION: Slash correct numbers, dodge wrong ones!",
+            "",
+            "🔢 LEVEL 1 TARGETS:",
+            "• Prime numbers (2, 3, 5, 7, 11...)",
+            "• Even numbers (2, 4, 6, 8...)",
+            "• Multiples of 3 (3, 6, 9, 12...)",
+            "",
+            "🔢 LEVEL 2 TARGETS:",
+            "• All Level 1 targets PLUS:",
+            "• Perfect squares (1, 4, 9, 16, 25...)",
+            "• Fibonacci numbers (0, 1, 1, 2, 3, 5, 8...)",
+            "",
+            "⚔️ SCORING:",
+            "• Level 1: +10 points for correct, -5 for wrong",
+            "• Level 2: +15 points for correct, -5 for wrong",
+            "",
+            "⏱️ TIME LIMITS:",
+            "• Level 1: 30 seconds total, 5 seconds per question",
+            "• Level 2: 30 seconds total, 4 seconds per question",
+        ]
         
     def show_instructions(self):
         self.clear_screen()
-        print("📜 NINJA TRAINING SCROLL 📜")
-        print("=" * 50)
-        print("🎯 MISSION: Slash correct numbers, dodge wrong ones!")
-        print("\n🔢 LEVEL 1 TARGETS:")
-        print("• Prime numbers (2, 3, 5, 7, 11...)")
-        print("• Even numbers (2, 4, 6, 8...)")
-        print("• Multiples of 3 (3, 6, 9, 12...)")
-        print("\n🔢 LEVEL 2 TARGETS:")
-        print("• All Level 1 targets PLUS:")
-        print("• Perfect squares (1, 4, 9, 16, 25...)")
-        print("• Fibonacci numbers (0, 1, 1, 2, 3, 5, 8...)")
-        print("\n⚔️ SCORING:")
-        print("• Level 1: +10 points for correct, -5 for wrong")
-        print("• Level 2: +15 points for correct, -5 for wrong")
-        print("\n⏱️ TIME LIMITS:")
-        print("• Level 1: 30 seconds total, 5 seconds per question")
-        print("• Level 2: 30 seconds total, 4 seconds per question")
+        print("\n".join(self.instruction_lines()))
         print("\nPress Enter to continue...")
         input()
         
@@ -274,6 +310,7 @@ class NinjaNumberSlash:
         self.correct_answers = 0
         self.total_questions = 0
         self.level = 1
+        self.difficulty.reset()
         
         # Play Level 1
         if self.play_level():
@@ -287,4 +324,7 @@ class NinjaNumberSlash:
 
 if __name__ == "__main__":
     game = NinjaNumberSlash()
-    game.main_menu()
\ No newline at end of file
+    game.expert = "--expert" in sys.argv
+    game.main_menu()
+    game.scores.close()
+    game.telemetry.close()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import os
+import sys
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+
+def supports_ansi(stream):
+    if os.environ.get("TERM", "") in ("", "dumb"):
+        return False
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+class TerminalRenderer:
+    """Keeps a copy of the screen and redraws only the lines that changed
+
+    Each frame is built as one string and written in a single call. On dumb
+    terminals, or when output isn't a terminal, frames are printed in full
+    and clearing just starts a new paragraph.
+    """
+
+    def __init__(self, stream=None, ansi=None, newline="\n"):
+        self.stream = stream if stream is not None else sys.stdout
+        self.ansi = supports_ansi(self.stream) if ansi is None else ansi
+        self.newline = newline
+        self.lines = []
+
+    def frame(self, lines):
+        """Text that turns the current screen into lines"""
+        if not self.ansi:
+            self.lines = list(lines)
+            return self.newline.join(lines) + self.newline
+
+        parts = []
+        for row, line in enumerate(lines):
+            if row >= len(self.lines) or self.lines[row] != line:
+                parts.append(f"\x1b[{row + 1};1H{line}{CLEAR_LINE}")
+        # Park the cursor below the frame and wipe prompts and replies left there
+        parts.append(f"\x1b[{len(lines) + 1};1H{CLEAR_BELOW}")
+        self.lines = list(lines)
+        return "".join(parts)
+
+    def clear_text(self):
+        self.lines = []
+        return CLEAR_SCREEN if self.ansi else self.newline
+
+    def write(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+    def render(self, lines):
+        self.write(self.frame(lines))
+
+    def clear(self):
+        self.write(self.clear_text())
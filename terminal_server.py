@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import time
+
+from terminal_based import NinjaNumberSlash
+from terminal_renderer import TerminalRenderer
+from score_store import ScoreStore
+from telemetry import TelemetryWriter
+
+MENU_LINES = [
+    "🗡️  NINJA MENU 🗡️",
+    "1. Start New Game",
+    "2. View Instructions",
+    "3. Quit",
+]
+
+
+class SessionClosed(Exception):
+    pass
+
+
+class GameSession:
+    """One connected player, driven by its own coroutine on the shared event loop"""
+
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.game = NinjaNumberSlash(server.scores, server.telemetry)
+        self.renderer = TerminalRenderer(ansi=True, newline="\r\n")
+
+    async def send(self, lines, clear=False):
+        text = "\r\n".join(lines) + "\r\n"
+        if clear:
+            text = self.renderer.clear_text() + text
+        await self.write(text)
+
+    async def write(self, text):
+        self.writer.write(text.encode("utf-8"))
+        await self.writer.drain()
+
+    async def receive(self, timeout=None):
+        """Next input line, or None if the deadline passes first"""
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        except (ValueError, asyncio.LimitOverrunError):
+            # A line past the stream limit is no answer; end the session instead of buffering more
+            await self.send(["❌ Input too long, closing the session."])
+            raise SessionClosed()
+        if not line:
+            raise SessionClosed()
+        return line.decode("utf-8", errors="replace")
+
+    async def run(self):
+        await self.send(["🥷 Welcome to the Ninja Number Slash dojo!", "Enter your ninja name:"], clear=True)
+        name = (await self.receive()).strip()[:20]
+        if name:
+            self.game.player_name = name
+
+        while True:
+            self.game.high_score = self.server.scores.high_score()
+            await self.send(MENU_LINES + [f"High Score: {self.game.high_score}", "",
+                                          "Enter your choice (1-3):"], clear=True)
+            choice = (await self.receive()).strip()
+            if choice == '1':
+                await self.play_game()
+            elif choice == '2':
+                await self.send(self.game.instruction_lines() + ["", "Press Enter to continue..."], clear=True)
+                await self.receive()
+            elif choice == '3':
+                await self.send(["🥷 Farewell, ninja! Train hard and return stronger!"])
+                return
+
+    async def play_game(self):
+        game = self.game
+        game.score = 0
+        game.correct_answers = 0
+        game.total_questions = 0
+        game.level = 1
+        game.difficulty.reset()
+
+        if await self.play_level():
+            game.level = 2
+            await self.play_level()
+
+        await self.send(game.final_stats_lines() + ["", "Press Enter to return to menu..."], clear=True)
+        game.record_score()
+        await self.receive()
+
+    async def play_level(self):
+        game = self.game
+        questions_this_level = 0
+        level_score = 0
+
+        await self.send([f"🥷 STARTING LEVEL {game.level}! 🥷", f"Time Limit: {game.time_limit} seconds",
+                         "Get ready ninja..."], clear=True)
+        await asyncio.sleep(2)
+        level_end = time.monotonic() + game.time_limit
+
+        while time.monotonic() < level_end:
+            number, time_per_question = game.next_question()
+            question_end = min(level_end, time.monotonic() + time_per_question)
+
+            while True:
+                now = time.monotonic()
+                if now >= question_end:
+                    if now < level_end:
+                        await self.send(["⏱️ Too slow! Next number..."])
+                    break
+
+                await self.write(self.renderer.frame(game.game_state_lines(number, level_end - now) +
+                                                     ["", "Quick! Make your choice:"]))
+                shown_at = time.monotonic()
+                user_input = await self.receive(question_end - now)
+                if user_input is None:
+                    continue
+
+                user_answer = game.parse_answer(user_input)
+                if user_answer == "quit":
+                    return False
+                if user_answer is None:
+                    await self.send(["❌ Invalid input! Use Y/N"])
+                    await asyncio.sleep(1)
+                    continue
+
+                is_correct, correct_answer, points = game.score_answer(number, user_answer,
+                                                                       time.monotonic() - shown_at)
+                questions_this_level += 1
+                if is_correct:
+                    level_score += points
+                await self.send(game.answer_feedback_lines(number, is_correct, correct_answer, points))
+                await asyncio.sleep(1.5)
+                break
+
+        await self.send(game.level_complete_lines(level_score, questions_this_level), clear=True)
+        if game.level == 1:
+            await asyncio.sleep(3)
+        return True
+
+
+async def close_writer(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+class NinjaServer:
+    def __init__(self, max_sessions=2000, score_path="scores.db", telemetry_path="telemetry.bin"):
+        self.max_sessions = max_sessions
+        self.sessions = set()
+        self.scores = ScoreStore(score_path)
+        self.telemetry = TelemetryWriter(telemetry_path)
+
+    async def handle_connection(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            try:
+                writer.write("🥷 The dojo is full, try again later.\r\n".encode("utf-8"))
+                await writer.drain()
+            except ConnectionError:
+                pass
+            await close_writer(writer)
+            return
+
+        session = GameSession(self, reader, writer)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            self.sessions.discard(session)
+            await close_writer(writer)
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🥷 Ninja Number Slash server listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Ninja Number Slash sessions over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--max-sessions", type=int, default=2000)
+    parser.add_argument("--scores", default="scores.db", help="score database shared by all sessions")
+    parser.add_argument("--telemetry", default="telemetry.bin", help="answer log shared by all sessions")
+    args = parser.parse_args()
+    server = NinjaServer(args.max_sessions, args.scores, args.telemetry)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("🥷 Server stopped")
+    finally:
+        server.scores.close()
+        server.telemetry.close()
+
+
+if __name__ == "__main__":
+    main()
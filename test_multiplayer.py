@@ -0,0 +1,36 @@
+import struct
+
+from multiplayer import ALL_FIELDS, FIELD_QUESTION, FIELD_TIMER, STATE, decode_state, encode_state
+
+
+def roundtrip(data):
+    length, kind = struct.unpack_from("<HB", data)
+    assert kind == STATE
+    assert length == len(data) - 3
+    return decode_state(data[3:])
+
+
+def test_full_state_with_18_digit_numbers():
+    question = (7, 999999999999999989, 2)
+    data = encode_state(ALL_FIELDS, "game", question, (2, 12.345),
+                        scores=[(1, 150), (2, -5)], roster=[(1, True, "alice"), (2, False, "bob")],
+                        results=[(6, 1, 1), (6, 2, 0)])
+    assert roundtrip(data) == {
+        "phase": "game",
+        "question": question,
+        "timer": (2, 12.345),
+        "scores": [(1, 150), (2, -5)],
+        "roster": [(1, True, "alice"), (2, False, "bob")],
+        "results": [(6, 1, 1), (6, 2, 0)],
+    }
+
+
+def test_delta_carries_only_masked_fields():
+    question = (12, 10 ** 18 - 1, 0)
+    fields = roundtrip(encode_state(FIELD_QUESTION | FIELD_TIMER, question=question, timer=(1, 0.5)))
+    assert fields == {"question": question, "timer": (1, 0.5)}
+
+
+def test_largest_number_fits():
+    question = (2 ** 32 - 1, 2 ** 64 - 1, 4)
+    assert roundtrip(encode_state(FIELD_QUESTION, question=question))["question"] == question
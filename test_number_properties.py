@@ -0,0 +1,83 @@
+from math import isqrt
+
+import pytest
+
+from number_properties import (MAX_NUMBER, is_even, is_fibonacci, is_multiple_of_3, is_perfect_square,
+                               is_prime)
+
+LIMIT = 20000
+
+
+def fibonacci_numbers(limit):
+    numbers = [0, 1]
+    while numbers[-1] + numbers[-2] <= limit:
+        numbers.append(numbers[-1] + numbers[-2])
+    return numbers
+
+
+def test_small_numbers_match_brute_force():
+    sieve = [False, False] + [True] * (LIMIT - 1)
+    for i in range(2, isqrt(LIMIT) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = [False] * len(sieve[i * i::i])
+    squares = {i * i for i in range(isqrt(LIMIT) + 1)}
+    fibonacci = set(fibonacci_numbers(LIMIT))
+    for n in range(LIMIT + 1):
+        assert is_prime(n) == sieve[n], n
+        assert is_perfect_square(n) == (n in squares), n
+        assert is_fibonacci(n) == (n in fibonacci), n
+        assert is_even(n) == (n % 2 == 0)
+        assert is_multiple_of_3(n) == (n % 3 == 0)
+
+
+@pytest.mark.parametrize("n", [
+    2 ** 31 - 1,
+    2 ** 61 - 1,
+    2 ** 63 - 25,  # largest prime below 2^63
+    2 ** 64 - 59,  # largest prime below 2^64
+    1000000000000000003,
+])
+def test_large_primes(n):
+    assert is_prime(n)
+
+
+@pytest.mark.parametrize("factors", [
+    # Carmichael numbers fool the Fermat test for every coprime base
+    (3, 11, 17),
+    (7, 13, 19),
+    (7, 23, 31),
+    (41, 101, 461),
+    (6763, 10627, 29863),
+    # Strong pseudoprime to every prime base up to 23
+    (149491, 747451, 34233211),
+    # Semiprimes close to 2^64
+    (4294967291, 4294967279),
+    (2 ** 31 - 1, 2 ** 31 - 1),
+])
+def test_composites(factors):
+    n = 1
+    for factor in factors:
+        n *= factor
+    assert n <= MAX_NUMBER
+    assert not is_prime(n)
+
+
+def test_squares_near_the_top_of_the_range():
+    for low in (2 ** 63, MAX_NUMBER):
+        root = isqrt(low)
+        for r in (root - 1, root):
+            square = r * r
+            assert is_perfect_square(square)
+            assert not is_perfect_square(square - 1)
+            assert not is_perfect_square(square + 1)
+    assert not is_perfect_square(MAX_NUMBER)
+
+
+def test_fibonacci_numbers_up_to_2_64():
+    numbers = fibonacci_numbers(MAX_NUMBER)
+    assert numbers[-1] == 12200160415121876738
+    for f in numbers:
+        assert is_fibonacci(f)
+    for f in numbers[5:]:
+        assert not is_fibonacci(f - 1)
+        assert not is_fibonacci(f + 1)
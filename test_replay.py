@@ -0,0 +1,66 @@
+import copy
+import random
+
+import pytest
+
+from game_logic import NinjaGameLogic
+from replay import ReplayClock, replay, verify
+
+
+def play(seed, pauses=(0.2, 1.5), expert=False):
+    """Record a game by a player who is right 80% of the time"""
+    rng = random.Random(seed)
+    clock = ReplayClock(5000.0)
+    logic = NinjaGameLogic(time_source=clock)
+    logic.expert = expert
+    logic.start_new_game(seed=rng.getrandbits(64))
+    while logic.game_state == "game":
+        clock.now += rng.uniform(*pauses)
+        right = logic.check_property(logic.current_number, logic.current_property)
+        logic.submit_answer(right if rng.random() < 0.8 else not right)
+    return logic.recording()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_reproduces_the_game(seed):
+    recording = play(seed)
+    assert recording["score"] > 0
+    assert verify(recording)
+    assert replay(recording).recording() == recording
+
+
+def test_replay_with_timed_out_questions_and_expert_numbers():
+    # Pauses longer than the time per question let questions run out between answers
+    recording = play(7, pauses=(0.5, 12.0), expert=True)
+    assert verify(recording)
+
+
+def test_reused_logic_replays_every_game():
+    recordings = [play(seed) for seed in range(4)]
+    logic = None
+    for recording in recordings:
+        logic = replay(recording, logic)
+        assert logic.score == recording["score"]
+
+
+def test_tampered_recordings_fail():
+    recording = play(11)
+
+    inflated = copy.deepcopy(recording)
+    inflated["score"] += 15
+    assert not verify(inflated)
+
+    flipped = copy.deepcopy(recording)
+    flipped["inputs"] = [[t, not answer] for t, answer in recording["inputs"]]
+    assert not verify(flipped)
+
+    reseeded = copy.deepcopy(recording)
+    reseeded["seed"] ^= 1
+    assert not verify(reseeded)
+
+
+def test_other_versions_are_rejected():
+    recording = play(3)
+    recording["version"] -= 1
+    with pytest.raises(ValueError):
+        replay(recording)
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import score_store
+from score_store import ScoreStore
+
+CRASHING_WRITER = """
+import os, sys
+from score_store import ScoreStore
+store = ScoreStore(sys.argv[1], legacy_path=None)
+store.record_game("crash", 70, 2, 7, 9)
+store.flush()
+os._exit(1)
+"""
+
+
+def wait_for(condition, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_games_are_there_after_reopening(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = ScoreStore(path, legacy_path=None)
+    store.record_game("alice", 120, 2, 12, 14)
+    store.record_game("bob", 80, 2, 8, 10)
+    store.record_game("alice", 90, 2, 9, 11)
+    store.close()
+
+    store = ScoreStore(path, legacy_path=None)
+    assert store.high_score() == 120
+    assert store.top_players() == [("alice", 120, 2), ("bob", 80, 1)]
+    assert store.rank("bob") == 2
+    store.close()
+
+
+def test_flushed_games_survive_a_crash(tmp_path):
+    path = str(tmp_path / "scores.db")
+    # The writer process dies without closing the store or its connections
+    result = subprocess.run([sys.executable, "-c", CRASHING_WRITER, path],
+                            cwd=os.path.dirname(os.path.abspath(score_store.__file__)))
+    assert result.returncode == 1
+
+    store = ScoreStore(path, legacy_path=None)
+    assert store.top_players() == [("crash", 70, 1)]
+    store.close()
+
+
+def test_writer_retries_a_locked_database(tmp_path, monkeypatch):
+    path = str(tmp_path / "scores.db")
+    store = ScoreStore(path, legacy_path=None)
+    monkeypatch.setattr(score_store, "WRITE_RETRY_SECONDS", 0.05)
+    monkeypatch.setattr(score_store, "connect", lambda p: sqlite3.connect(p, timeout=0.05))
+
+    blocker = sqlite3.connect(path)
+    blocker.execute("BEGIN EXCLUSIVE")
+    store.record_game("alice", 50, 1, 5, 6)
+    store.flush()
+    assert store.write_errors >= 1
+    assert store.writer.is_alive()
+
+    blocker.rollback()
+    blocker.close()
+    assert wait_for(lambda: store.top_players() == [("alice", 50, 1)])
+    store.record_game("bob", 30, 1, 3, 4)
+    store.flush()
+    assert store.top_players() == [("alice", 50, 1), ("bob", 30, 1)]
+    store.close()
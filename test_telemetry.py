@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+
+from number_properties import MAX_NUMBER, PROPERTY_NAMES
+from telemetry import BLOCK_HEADER, RECORD_SIZE, TelemetryStats, TelemetryWriter, read_blocks
+
+ANSWERS = [
+    (7, "prime", 0.5, True),
+    (MAX_NUMBER, "even", 1.25, False),
+    (10 ** 18 - 1, "multiple_of_3", 0.75, True),
+    (64, "perfect_square", 2.0, True),
+    (21, "fibonacci", 3.5, False),
+    (9, "prime", 0.25, False),
+]
+
+
+def write_log(path, answers, block_size=4):
+    writer = TelemetryWriter(path, block_size=block_size)
+    for i, (number, property_type, latency, correct) in enumerate(answers):
+        writer.record(number, property_type, latency, correct, timestamp=1000.0 + i)
+    writer.close()
+
+
+def read_log(path):
+    blocks = list(read_blocks(path))
+    return {name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]}
+
+
+def test_round_trip_across_blocks(tmp_path):
+    path = str(tmp_path / "telemetry.bin")
+    write_log(path, ANSWERS)
+    assert len(list(read_blocks(path))) == 2
+
+    log = read_log(path)
+    assert log["number"].tolist() == [n for n, _, _, _ in ANSWERS]
+    assert [PROPERTY_NAMES[p] for p in log["property"]] == [p for _, p, _, _ in ANSWERS]
+    assert log["latency_ms"].tolist() == [latency * 1000 for _, _, latency, _ in ANSWERS]
+    assert log["correct"].tolist() == [int(c) for _, _, _, c in ANSWERS]
+    assert log["timestamp"].tolist() == [1000.0 + i for i in range(len(ANSWERS))]
+
+
+def test_reopening_appends(tmp_path):
+    path = str(tmp_path / "telemetry.bin")
+    write_log(path, ANSWERS[:3])
+    write_log(path, ANSWERS[3:])
+    assert read_log(path)["number"].tolist() == [n for n, _, _, _ in ANSWERS]
+
+
+def test_truncated_tail_ends_the_stream(tmp_path):
+    path = str(tmp_path / "telemetry.bin")
+    write_log(path, ANSWERS)
+    size = os.path.getsize(path)
+    first_block = BLOCK_HEADER.size + 4 * RECORD_SIZE
+
+    # A crash can cut the last block anywhere, header included
+    for cut in (size - 1, first_block + BLOCK_HEADER.size + 3, first_block + 5):
+        with open(path, "r+b") as f:
+            f.truncate(cut)
+        assert read_log(path)["number"].tolist() == [n for n, _, _, _ in ANSWERS[:4]]
+
+
+def test_stats_accuracy_and_percentiles(tmp_path):
+    path = str(tmp_path / "telemetry.bin")
+    write_log(path, ANSWERS)
+    stats = TelemetryStats(batch_records=3)
+    for block in read_blocks(path):
+        stats.add_block(block)
+    summary = stats.summary()
+
+    assert summary["prime"]["answers"] == 2
+    assert summary["prime"]["accuracy"] == 0.5
+    assert summary["all"]["answers"] == len(ANSWERS)
+    assert summary["all"]["accuracy"] == 0.5
+    assert summary["all"]["p50_ms"] == 750
+    assert "perfect_square" in summary and "fibonacci" in summary
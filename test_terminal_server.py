@@ -0,0 +1,54 @@
+import asyncio
+
+from terminal_server import NinjaServer
+
+
+async def talk(server, lines, limit=None):
+    """Connect to a fresh server, send lines and return everything it sends back until it hangs up"""
+    kwargs = {} if limit is None else {"limit": limit}
+    listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0, **kwargs)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for line in lines:
+            writer.write(line)
+        await writer.drain()
+        received = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        await writer.wait_closed()
+        # The session has finished its cleanup once it has left the server's set
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+    return received.decode("utf-8")
+
+
+def make_server(tmp_path, max_sessions=10):
+    return NinjaServer(max_sessions, str(tmp_path / "scores.db"), str(tmp_path / "telemetry.bin"))
+
+
+def test_quit_from_the_menu(tmp_path):
+    server = make_server(tmp_path)
+    received = asyncio.run(talk(server, [b"kai\r\n", b"3\r\n"]))
+    assert "Farewell, ninja" in received
+    assert not server.sessions
+    server.scores.close()
+    server.telemetry.close()
+
+
+def test_overlong_line_closes_the_session(tmp_path):
+    server = make_server(tmp_path)
+    received = asyncio.run(talk(server, [b"x" * 4096 + b"\r\n"], limit=1024))
+    assert "Input too long" in received
+    assert not server.sessions
+    server.scores.close()
+    server.telemetry.close()
+
+
+def test_full_server_turns_players_away(tmp_path):
+    server = make_server(tmp_path, max_sessions=0)
+    received = asyncio.run(talk(server, []))
+    assert "The dojo is full" in received
+    server.scores.close()
+    server.telemetry.close()
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pytest
+
+from game_logic import NinjaGameLogic
+from number_properties import PROPERTY_NAMES
+from replay import ReplayClock
+from vector_env import NinjaVectorEnv
+
+
+class ScriptedEnv(NinjaVectorEnv):
+    """One game that asks the questions a NinjaGameLogic asked, in the same order"""
+
+    def __init__(self, questions, **kwargs):
+        self.questions = questions
+        super().__init__(1, **kwargs)
+
+    def new_questions(self, envs):
+        super().new_questions(envs)
+        for env in envs:
+            number, property_type = self.questions.pop(0)
+            self.number[env] = number
+            self.property[env] = PROPERTY_NAMES.index(property_type)
+
+
+def scalar_game(questions, time_limit):
+    """NinjaGameLogic on the env's fixed level configs, logging every question it asks"""
+    clock = ReplayClock()
+    logic = NinjaGameLogic(time_source=clock)
+    logic.time_limit = time_limit
+    # The env doesn't adapt, so neither the range nor the time per question may move
+    logic.difficulty.adjust_reach = lambda *args: None
+    logic.difficulty.time_per_question = lambda base: base
+    generate_question = logic.generate_question
+
+    def logged(now=None):
+        generate_question(now)
+        questions.append((logic.current_number, logic.current_property))
+    logic.generate_question = logged
+    return logic, clock
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_env_matches_the_game_logic(seed):
+    questions = []
+    logic, clock = scalar_game(questions, time_limit=20)
+    logic.start_new_game(seed=seed)
+    env = ScriptedEnv(questions, time_limit=20, seed=seed)
+    env.reset()
+
+    rng = random.Random(seed)
+    games = 0
+    timed_out = 0
+    for _ in range(2000):
+        # Long pauses let questions run out and answers land after a level's time
+        latency = rng.choice([rng.uniform(0.2, 2.0), rng.uniform(3.0, 12.0)])
+        right = logic.check_property(logic.current_number, logic.current_property)
+        answer = right if rng.random() < 0.7 else not right
+        assert env.number[0] == logic.current_number
+
+        before = logic.score
+        asked = len(questions)
+        clock.now += latency
+        logic.submit_answer(answer)
+        done = logic.game_state == "game_over"
+        timed_out += len(questions) - asked - (not done)
+        final_score = logic.score
+        if done:
+            games += 1
+            logic.start_new_game(seed=rng.getrandbits(64))
+
+        observation, rewards, dones, info = env.step(np.array([answer]), latency)
+        assert dones[0] == done
+        assert rewards[0] == final_score - before
+        if done:
+            assert info["final_score"][0] == final_score
+        else:
+            assert observation["level"][0] == logic.level
+            assert observation["time_left"][0] == pytest.approx(logic.time_left)
+        assert observation["score"][0] == logic.score
+        assert not questions
+
+    assert games > 10 and timed_out > 100
+
+
+def test_answer_after_level_one_is_scored_at_level_two():
+    env = NinjaVectorEnv(4, time_limit=10, seed=0, question_timeout=False)
+    env.reset()
+    env.step(env.correct_actions(), 9.0)
+    _, rewards, dones, _ = env.step(env.correct_actions(), 2.0)
+    assert not dones.any()
+    assert (env.level == 2).all()
+    assert env.time_left == pytest.approx(np.full(4, 9.0))
+    # Like submit_answer, the answer goes to the first level 2 question, at level 2 points
+    assert set(rewards.tolist()) <= {15, -5}
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces
+
+    Surfaces are keyed on (font, text, color, scale), scaled ones being
+    rendered at full size and shrunk once. Fonts handed out by font()
+    are shared per (path, size), so a font object stands for its size too.
+    """
+
+    def __init__(self, max_entries=512, max_fonts=32):
+        self.max_entries = max_entries
+        self.max_fonts = max_fonts
+        self.surfaces = OrderedDict()
+        self.fonts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, path, size):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.fonts.move_to_end(key)
+            return font
+        font = pygame.font.Font(path, size)
+        self.fonts[key] = font
+        if len(self.fonts) > self.max_fonts:
+            # Surfaces rendered with the evicted font age out of the LRU on their own
+            self.fonts.popitem(last=False)
+        return font
+
+    def render(self, font, text, color, scale=1.0):
+        key = (font, text, tuple(color), scale)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        if scale != 1.0:
+            width, height = surface.get_size()
+            surface = pygame.transform.smoothscale(surface, (max(1, round(width * scale)),
+                                                             max(1, round(height * scale))))
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.fonts.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.surfaces),
+        }
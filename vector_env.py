@@ -0,0 +1,226 @@
+import argparse
+import time
+
+import numpy as np
+
+from game_logic import LEVEL_CONFIGS, LEVEL_POINTS, WRONG_PENALTY
+from number_properties import PROPERTY_NAMES, get_property_index
+
+LEVELS = sorted(LEVEL_CONFIGS)
+
+
+def property_table(number_range, cache_dir=None):
+    """Boolean table [property id, number - low] for every property over a range"""
+    low, high = number_range
+    index = get_property_index(number_range, cache_dir)
+    size = high - low + 1
+    table = np.zeros((len(PROPERTY_NAMES), size), dtype=bool)
+    for i, name in enumerate(PROPERTY_NAMES):
+        bits = np.frombuffer(index.bitsets[name], dtype=np.uint8)
+        table[i] = np.unpackbits(bits, bitorder="little")[:size]
+    return table
+
+
+class NinjaVectorEnv:
+    """num_envs independent games of the pygame rules, stepped together
+
+    Every game state lives in a NumPy array with one slot per game, and
+    each step() scores one answer from every game at once. Questions are
+    class-balanced like QuestionStream: a level property is picked
+    uniformly, then a "yes" or "no" number with even odds. Timing follows
+    NinjaGameLogic.submit_answer: questions left unanswered past their
+    level's time per question give way to new ones, an answer that comes
+    after level 1 ran out is scored on a level 2 question, and a game
+    that finishes is reset in place so the batch never shrinks.
+    """
+
+    def __init__(self, num_envs, time_limit=30, seed=None, level_points=None, wrong_penalty=WRONG_PENALTY,
+                 question_timeout=True, cache_dir=None):
+        self.num_envs = num_envs
+        self.time_limit = time_limit
+        self.level_points = np.array([0] + [(level_points or LEVEL_POINTS)[level] for level in LEVELS])
+        self.wrong_penalty = wrong_penalty
+        self.question_timeout = question_timeout
+        self.rng = np.random.default_rng(seed)
+
+        self.low = min(LEVEL_CONFIGS[level]["number_range"][0] for level in LEVELS)
+        high = max(LEVEL_CONFIGS[level]["number_range"][1] for level in LEVELS)
+        self.truth = property_table((self.low, high), cache_dir)
+        self.build_question_tables()
+
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.level = np.ones(num_envs, dtype=np.int8)
+        self.time_left = np.zeros(num_envs, dtype=np.float64)
+        self.question_time_left = np.zeros(num_envs, dtype=np.float64)
+        self.number = np.zeros(num_envs, dtype=np.int64)
+        self.property = np.zeros(num_envs, dtype=np.int8)
+        self.correct_answers = np.zeros(num_envs, dtype=np.int64)
+        self.total_questions = np.zeros(num_envs, dtype=np.int64)
+
+    def build_question_tables(self):
+        """Per level: its property ids, and one pool of numbers per (property, answer)"""
+        max_properties = max(len(LEVEL_CONFIGS[level]["properties"]) for level in LEVELS)
+        self.level_properties = np.zeros((len(LEVELS) + 1, max_properties), dtype=np.int8)
+        self.level_property_count = np.zeros(len(LEVELS) + 1, dtype=np.int64)
+        self.time_per_question = np.zeros(len(LEVELS) + 1)
+        self.pool_start = np.zeros((len(LEVELS) + 1, len(PROPERTY_NAMES), 2), dtype=np.int64)
+        self.pool_size = np.zeros((len(LEVELS) + 1, len(PROPERTY_NAMES), 2), dtype=np.int64)
+
+        pools = []
+        offset = 0
+        for level in LEVELS:
+            config = LEVEL_CONFIGS[level]
+            low, high = config["number_range"]
+            ids = [PROPERTY_NAMES.index(p) for p in config["properties"]]
+            self.level_properties[level, :len(ids)] = ids
+            self.level_property_count[level] = len(ids)
+            self.time_per_question[level] = config["time_per_question"]
+            numbers = np.arange(low, high + 1)
+            for prop in ids:
+                flags = self.truth[prop, low - self.low:high - self.low + 1]
+                for answer in (False, True):
+                    pool = numbers[flags == answer]
+                    if not len(pool):
+                        # A range without this class asks about the other one instead
+                        pool = numbers[flags != answer]
+                    self.pool_start[level, prop, int(answer)] = offset
+                    self.pool_size[level, prop, int(answer)] = len(pool)
+                    pools.append(pool)
+                    offset += len(pool)
+        self.pools = np.concatenate(pools)
+
+    def new_questions(self, envs):
+        levels = self.level[envs]
+        count = len(envs)
+        choice = (self.rng.random(count) * self.level_property_count[levels]).astype(np.int64)
+        properties = self.level_properties[levels, choice]
+        answers = (self.rng.random(count) < 0.5).astype(np.int64)
+        sizes = self.pool_size[levels, properties, answers]
+        picks = self.pool_start[levels, properties, answers] + (self.rng.random(count) * sizes).astype(np.int64)
+        self.number[envs] = self.pools[picks]
+        self.property[envs] = properties
+        self.question_time_left[envs] = self.time_per_question[levels]
+
+    def check_property(self, numbers, properties):
+        """Vectorized check_property over batches of numbers and property ids"""
+        return self.truth[properties, numbers - self.low]
+
+    def correct_actions(self):
+        """The right answer to every current question, for scripted bots"""
+        return self.check_property(self.number, self.property)
+
+    def reset_envs(self, envs):
+        self.score[envs] = 0
+        self.level[envs] = 1
+        self.time_left[envs] = self.time_limit
+        self.correct_answers[envs] = 0
+        self.total_questions[envs] = 0
+        self.new_questions(envs)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(np.arange(self.num_envs))
+        return self.observation()
+
+    def observation(self):
+        return {
+            "number": self.number.copy(),
+            "property": self.property.copy(),
+            "level": self.level.copy(),
+            "time_left": self.time_left.copy(),
+            "question_time_left": self.question_time_left.copy(),
+            "score": self.score.copy(),
+        }
+
+    def expire_questions(self):
+        """Replace every question whose time ran out before its level did, as often as it takes"""
+        if not self.question_timeout:
+            return
+        while True:
+            expired = np.flatnonzero((self.question_time_left <= 0) &
+                                     (self.question_time_left < self.time_left))
+            if not len(expired):
+                return
+            # Each new question starts at the deadline of the one it replaces
+            overshoot = self.question_time_left[expired]
+            self.new_questions(expired)
+            self.question_time_left[expired] += overshoot
+
+    def step(self, actions, latencies=1.0):
+        """Answer every game's question after latencies seconds
+
+        actions are booleans (True = slash). Returns (observation, rewards,
+        dones, info); info["final_score"] holds the score of each game that
+        finished this step, and the games themselves have been reset.
+        """
+        actions = np.asarray(actions, dtype=bool)
+        latencies = np.broadcast_to(np.asarray(latencies, dtype=np.float64), (self.num_envs,))
+
+        self.time_left -= latencies
+        self.question_time_left -= latencies
+        self.expire_questions()
+        # Level 2 starts where level 1 ran out, its first question with it
+        advance = (self.time_left <= 0) & (self.level == 1)
+        if advance.any():
+            advanced = np.flatnonzero(advance)
+            self.level[advanced] = 2
+            self.time_left[advanced] += self.time_limit
+            overshoot = self.time_left[advanced] - self.time_limit
+            self.new_questions(advanced)
+            self.question_time_left[advanced] += overshoot
+            self.expire_questions()
+        dones = self.time_left <= 0
+
+        # Every answer in a game still running is scored, at the level it is now on
+        levels = self.level.astype(np.int64)
+        in_time = ~dones
+        correct = actions == self.correct_actions()
+        scored = in_time & correct
+        missed = in_time & ~correct
+
+        before = self.score.copy()
+        self.score += np.where(scored, self.level_points[levels], 0)
+        self.score = np.where(missed, np.maximum(0, self.score - self.wrong_penalty), self.score)
+        self.total_questions += in_time
+        self.correct_answers += scored
+        rewards = self.score - before
+
+        final_score = np.where(dones, self.score, 0)
+        finished = np.flatnonzero(dones)
+        playing = np.flatnonzero(~dones)
+        self.new_questions(playing)
+        if len(finished):
+            self.reset_envs(finished)
+        return self.observation(), rewards, dones, {"final_score": final_score}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure NinjaVectorEnv throughput with scripted players")
+    parser.add_argument("--envs", type=int, default=65536)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--accuracy", type=float, default=0.8, help="share of answers the bot gets right")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env = NinjaVectorEnv(args.envs, seed=args.seed)
+    env.reset()
+    rng = np.random.default_rng(args.seed + 1)
+    finished_scores = []
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        right = rng.random(args.envs) < args.accuracy
+        actions = np.where(right, env.correct_actions(), ~env.correct_actions())
+        _, _, dones, info = env.step(actions, rng.uniform(0.5, 2.0, args.envs))
+        finished_scores.append(info["final_score"][dones])
+    elapsed = time.perf_counter() - start
+
+    scores = np.concatenate(finished_scores)
+    answers = args.envs * args.steps
+    print(f"{answers} answers in {elapsed:.2f}s ({answers / elapsed / 1e6:.2f}M answers/s), "
+          f"{len(scores)} games finished, mean score {scores.mean() if len(scores) else 0:.1f}")
+
+
+if __name__ == "__main__":
+    main()
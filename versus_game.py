@@ -0,0 +1,143 @@
+import sys
+
+from multiplayer import ThreadedMatchClient
+from pygame_based import (FPS, GOLD, SCREEN_WIDTH, SILVER, WHITE, YELLOW,
+                          NinjaNumberSlashGame)
+
+DEFAULT_PORT = 8024
+STANDINGS_SHOWN = 8
+
+
+class VersusGame(NinjaNumberSlashGame):
+    """Head-to-head client: the match server owns the questions, scores and timers
+
+    Each frame copies the latest server state from the network thread. The
+    timer is predicted locally between syncs, and animations run on the
+    game's own fixed timestep, so nothing waits on the network.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, **kwargs):
+        # The standings panel is not one of the dirty-rect regions
+        if kwargs.get("render_mode") != "scaled":
+            kwargs["render_mode"] = "full"
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.client = None
+        self.match_phase = "waiting"
+        self.shown_question = 0
+
+    def start_new_game(self, seed=None):
+        self.close_match()
+        self.client = ThreadedMatchClient(self.host, self.port, self.player_name)
+        self.score = 0
+        self.correct_answers = 0
+        self.total_questions = 0
+        self.level = 1
+        self.match_phase = "waiting"
+        self.shown_question = 0
+        self.warned_level = None
+        self.game_state = "game"
+
+    def close_match(self):
+        if self.client is not None:
+            self.client.close()
+
+    def submit_answer(self, user_answer):
+        if self.client is not None and self.match_phase == "game":
+            self.client.answer(user_answer)
+
+    def update(self, now=None):
+        if self.game_state != "game" or self.client is None:
+            return
+
+        client = self.client
+        if client.error is not None:
+            print(f"⚠ Could not reach the match server at {self.host}:{self.port}: {client.error}")
+            self.client = None
+            self.game_state = "menu"
+            return
+
+        self.match_phase = client.phase
+        self.level = client.level
+        self.time_left = client.time_left()
+        if client.question_id != self.shown_question:
+            self.shown_question = client.question_id
+            self.current_number = client.number
+            self.current_property = client.property_type
+            self.number_scale = self.prev_number_scale = 1.3
+
+        while client.results:
+            _, player_id, correct = client.results.popleft()
+            if player_id == client.player_id:
+                self.total_questions += 1
+                self.correct_answers += correct
+                self.show_answer_effect(bool(correct))
+        self.score = client.score()
+
+        lost_connection = not client.connected and client.player_id is not None
+        if client.phase == "game_over" or lost_connection:
+            self.game_state = "game_over"
+            self.on_game_over()
+            self.close_match()
+
+    def on_game_over(self):
+        # The server owns match results; they are neither single-player scores nor replayable recordings
+        pass
+
+    def question_bar_width(self):
+        # The server runs the question timer and doesn't sync it
+        return None
+
+    def play_level_cues(self, previous_level):
+        # The lobby countdown runs on the same timer, but is no reason to warn
+        if self.match_phase == "game":
+            super().play_level_cues(previous_level)
+
+    def draw_lobby(self):
+        self.draw_background(overlay_alpha=100)
+        joined = len(self.client.standings()) if self.client is not None else 0
+        if self.match_phase == "countdown":
+            title = f"Match starts in {self.time_left:.0f}..."
+        else:
+            title = "Waiting for ninjas..."
+        self.draw_text_with_shadow(title, self.big_font, GOLD, SCREEN_WIDTH//2, 250, shadow_offset=3)
+        self.draw_text_with_shadow(f"{joined} ninja(s) in the dojo", self.medium_font, WHITE,
+                                  SCREEN_WIDTH//2, 330)
+        self.draw_ninja(SCREEN_WIDTH//2, 550, 60)
+
+    def draw_standings(self):
+        if self.client is None:
+            return
+        y_offset = 170
+        for position, (name, score, is_me) in enumerate(self.client.standings()[:STANDINGS_SHOWN], 1):
+            color = YELLOW if is_me else SILVER
+            line = f"{position}. {name[:12]} {score}"
+            self.screen.blit(self.render_text(self.tiny_font, line, color), self.point(SCREEN_WIDTH - 190, y_offset))
+            y_offset += 26
+
+    def draw_game(self):
+        if self.match_phase in ("waiting", "countdown"):
+            self.draw_lobby()
+        else:
+            super().draw_game()
+        self.draw_standings()
+
+    def draw_game_over(self):
+        super().draw_game_over()
+        self.draw_standings()
+
+    def run(self):
+        super().run()
+        self.close_match()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python versus_game.py HOST[:PORT] [--fps N] [--scaled]")
+        sys.exit(1)
+    host, _, port = sys.argv[1].partition(":")
+    fps = int(sys.argv[sys.argv.index("--fps") + 1]) if "--fps" in sys.argv else FPS
+    render_mode = "scaled" if "--scaled" in sys.argv else "full"
+    game = VersusGame(host, int(port) if port else DEFAULT_PORT, fps=fps, render_mode=render_mode)
+    game.run()